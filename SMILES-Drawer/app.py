@@ -1,5 +1,8 @@
+import argparse
+import codecs
 import http.server
-import socketserver
+import json
+import os
 import threading
 import time
 from selenium import webdriver
@@ -7,46 +10,141 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
 PORT = 8000
+# POST bodies are read in bounded chunks; larger payloads are rejected
+POST_CHUNK_SIZE = 64 * 1024
+MAX_POST_BYTES = 1024 * 1024
+
+# Set by the page's unload beacon (POST /shutdown) so the main thread can
+# block instead of polling the WebDriver for open windows.
+shutdown_event = threading.Event()
+# Fallback re-check interval for windows that die without firing unload
+WINDOW_CHECK_INTERVAL = 5.0
+
+# Resolved chromedriver path, reused across launches (refresh with --update-driver)
+DRIVER_CACHE = os.path.expanduser("~/.cache/smiles-drawer/chromedriver.json")
+
+# Injected after launch: notify the server when the app window goes away
+_UNLOAD_BEACON_JS = "window.addEventListener('pagehide', function () { navigator.sendBeacon('/shutdown'); });"
 
 class SmilesRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Handles GET requests for files and POST requests for SMILES data."""
+    # Persistent connections: the app window reuses one socket for its assets.
+    # Every response must therefore carry Content-Length.
+    protocol_version = "HTTP/1.1"
+
+    def _content_length(self) -> int:
+        """Declared body size; ValueError if the header is malformed or negative."""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length < 0:
+            raise ValueError(f"negative Content-Length: {length}")
+        return length
+
+    def _iter_body(self):
+        """Yield the request body in chunks of at most POST_CHUNK_SIZE bytes."""
+        remaining = self._content_length()
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, POST_CHUNK_SIZE))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    def _read_body(self) -> str:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        parts = [decoder.decode(chunk) for chunk in self._iter_body()]
+        parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts)
+
+    def _discard_body(self) -> None:
+        for _ in self._iter_body():
+            pass
+
+    def _reply(self, code: int, body: bytes = b"") -> None:
+        self.send_response(code)
+        self.send_header('Content-type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
     def do_POST(self):
+        try:
+            length = self._content_length()
+        except ValueError:
+            # Body size unknown, so the rest of the stream can't be framed
+            self.close_connection = True
+            self._reply(400, b"Bad Request")
+            return
+        if length > MAX_POST_BYTES:
+            # Don't drain an oversized body; drop the connection instead
+            self.close_connection = True
+            self._reply(413, b"Payload Too Large")
+            return
         if self.path == '/save_smiles':
             try:
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                smiles_string = post_data.decode('utf-8')
+                smiles_string = self._read_body()
                 
                 print(f"[SMILES Received]: {smiles_string}")
                 
-                self.send_response(200)
-                self.send_header('Content-type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b"OK")
+                self._reply(200, b"OK")
             except Exception as e:
                 print(f"Error processing POST request: {e}")
-                self.send_response(500)
-                self.end_headers()
-                self.wfile.write(b"ERROR")
+                self.close_connection = True
+                self._reply(500, b"ERROR")
+        elif self.path == '/shutdown':
+            self._discard_body()
+            shutdown_event.set()
+            self._reply(204)
         else:
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(b"Not Found")
+            self._discard_body()
+            self._reply(404, b"Not Found")
 
     def do_GET(self):
         # Serve files using the default handler
         super().do_GET()
 
 # --- Server Setup ---
-HttdServer = socketserver.TCPServer(('', PORT), SmilesRequestHandler)
+# Threaded so parallel asset GETs and /save_smiles POSTs don't queue behind
+# each other (HTTPServer already sets allow_reuse_address). Only the local app
+# window talks to it, so bind loopback rather than every interface.
+HOST = "localhost"
+HttdServer = http.server.ThreadingHTTPServer((HOST, PORT), SmilesRequestHandler)
 
 def run_server():
     """Runs the HTTP server in a separate thread."""
-    print(f"Starting server on http://localhost:{PORT}")
+    print(f"Starting server on http://{HOST}:{PORT}")
     HttdServer.serve_forever()
 
+def _install_driver() -> str:
+    """Download/resolve chromedriver via webdriver_manager and remember the path."""
+    path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE), exist_ok=True)
+        with open(DRIVER_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"path": path}, f)
+    except OSError as e:
+        print(f"Could not cache driver path: {e}")
+    return path
+
+def resolve_driver_path(update: bool = False):
+    """Return (path, from_cache). Only hits the network when no usable cache exists."""
+    if not update:
+        try:
+            with open(DRIVER_CACHE, encoding="utf-8") as f:
+                path = json.load(f).get("path")
+            if path and os.path.exists(path):
+                return path, True
+        except (OSError, ValueError, AttributeError):
+            pass
+    return _install_driver(), False
+
 # --- Main Application Logic ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SMILES drawer app window")
+    parser.add_argument("--update-driver", action="store_true",
+                        help="re-resolve chromedriver instead of using the cached path")
+    args = parser.parse_args()
+
     # Start the server in a background thread
     # The daemon=True flag means the thread will automatically die when the main script exits
     server_thread = threading.Thread(target=run_server, daemon=True)
@@ -54,7 +152,7 @@ if __name__ == "__main__":
     time.sleep(1) # Give the server a moment to start
 
     # --- Browser Setup ---
-    service = Service(ChromeDriverManager().install())
+    driver_path, driver_cached = resolve_driver_path(update=args.update_driver)
     options = webdriver.ChromeOptions()
     # This is the key option to create a minimal app-like window
     options.add_argument(f"--app=http://localhost:{PORT}")
@@ -75,15 +173,33 @@ if __name__ == "__main__":
     try:
         print("Launching application window...")
         print("Close the application window to shut down the server.")
-        driver = webdriver.Chrome(service=service, options=options)
-        
-        # The script will now wait here until the browser window is closed.
-        # We can do this by periodically checking if the window is still open.
+        try:
+            driver = webdriver.Chrome(service=Service(driver_path), options=options)
+        except Exception:
+            if not driver_cached:
+                raise
+            # Cached driver no longer matches the installed Chrome; refresh once
+            driver_path, driver_cached = resolve_driver_path(update=True)
+            driver = webdriver.Chrome(service=Service(driver_path), options=options)
+        driver.execute_script(_UNLOAD_BEACON_JS)
+
+        # Block until the page's unload beacon arrives instead of polling. The
+        # timeout only covers windows that close without unloading (crash).
+        timeout = WINDOW_CHECK_INTERVAL
         while True:
+            woke = shutdown_event.wait(timeout=timeout)
+            shutdown_event.clear()
             if not driver.window_handles:
                 # This means the user has closed the window
                 break
-            time.sleep(0.5)
+            if woke:
+                # Beacon but window still listed: either still closing or the
+                # page reloaded (new document, listener lost). Re-arm and
+                # re-check shortly.
+                driver.execute_script(_UNLOAD_BEACON_JS)
+                timeout = 0.25
+            else:
+                timeout = WINDOW_CHECK_INTERVAL
 
     except Exception as e:
         # This block will catch errors if the user closes the window before the session starts
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Dict, List, Any
 import csv
@@ -7,6 +8,14 @@ import os
 
 from .normalization import canonicalize
 
+# Optional fast CSV reader (falls back to stdlib csv when unavailable)
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pacsv  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    pacsv = None  # type: ignore
+
 
 @dataclass
 class UnifiedRow:
@@ -39,38 +48,79 @@ ULLMANN_COLUMN_MAP = {
 }
 
 
-def _read_csv_rows(path: str) -> List[Dict[str, Any]]:
-    rows: List[Dict[str, Any]] = []
+ULLMANN_SOURCE_COLUMNS = [
+    "ReactionType", "CoreGeneric", "CoreDetail", "Ligand", "ReagentRaw",
+    "Solvent", "Temperature_C", "Time_h", "Yield_%", "Reference",
+]
+
+
+def _delimiter_for(path: str) -> str:
+    return '\t' if path.lower().endswith('.tsv') else ','
+
+
+def _read_csv_columns(path: str, columns: List[str]) -> Dict[str, List[Any]]:
+    """Read only `columns` from a CSV/TSV file as column -> list of values.
+
+    Uses pyarrow's multithreaded parser when available; missing columns come
+    back as lists of None. Rows that pyarrow rejects (e.g. ragged rows) make
+    us fall back to the tolerant stdlib reader.
+    """
+    if pacsv is not None:
+        try:
+            tbl = pacsv.read_csv(
+                path,
+                parse_options=pacsv.ParseOptions(delimiter=_delimiter_for(path)),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=columns,
+                    include_missing_columns=True,
+                    column_types={c: pa.string() for c in columns},
+                    # only empty cells are missing; "NA"/"null" stay literal like csv
+                    null_values=[''],
+                    strings_can_be_null=True,
+                ),
+            )
+            return {c: tbl.column(c).to_pylist() for c in columns}
+        except pa.ArrowInvalid:
+            pass
+    return _read_csv_columns_stdlib(path, columns)
+
+
+def _read_csv_columns_stdlib(path: str, columns: List[str]) -> Dict[str, List[Any]]:
+    out: Dict[str, List[Any]] = {c: [] for c in columns}
     with open(path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        reader = csv.DictReader(f, delimiter=_delimiter_for(path))
         for r in reader:
-            rows.append(r)
-    return rows
+            for c in columns:
+                out[c].append(r.get(c))
+    return out
+
+
+def _as_float(x):
+    try:
+        return float(x) if x not in (None, "", [], {}) else None
+    except Exception:
+        return None
+
+
+def _strip(x) -> str:
+    return (x or "").strip()
 
 
 def adapt_ullmann(path: str) -> List[UnifiedRow]:
-    raw = _read_csv_rows(path)
+    cols = _read_csv_columns(path, ULLMANN_SOURCE_COLUMNS)
     out: List[UnifiedRow] = []
 
-    for r in raw:
-        rt = (r.get("ReactionType") or "").strip() or "Ullmann"
-        metal = (r.get("CoreGeneric") or r.get("CoreDetail") or "").strip()
-        ligand = (r.get("Ligand") or "").strip()
-        base = (r.get("ReagentRaw") or "").strip()
-        solvent = (r.get("Solvent") or "").strip()
-        temp = r.get("Temperature_C")
-        time = r.get("Time_h")
-        yld = r.get("Yield_%")
-        source = (r.get("Reference") or "").strip()
-
-        def _as_float(x):
-            try:
-                return float(x) if x not in (None, "", [], {}) else None
-            except Exception:
-                return None
+    for rt, core_generic, core_detail, ligand, base, solvent, temp, time, yld, source in zip(
+        *(cols[c] for c in ULLMANN_SOURCE_COLUMNS)
+    ):
+        metal = _strip(core_generic or core_detail)
+        ligand = _strip(ligand)
+        base = _strip(base)
+        solvent = _strip(solvent)
+        source = _strip(source)
 
         row = UnifiedRow(
-            reaction_type=rt,
+            reaction_type=_strip(rt) or "Ullmann",
             metal=metal or None,
             catalyst=None,
             ligand=ligand or None,
@@ -89,8 +139,36 @@ def adapt_ullmann(path: str) -> List[UnifiedRow]:
     return out
 
 
+# Adapted rows keyed by (adapter, abspath, mtime_ns, size); a changed file gets
+# a new key, so stale entries simply age out of the LRU.
+_ADAPT_CACHE: "OrderedDict[tuple, List[UnifiedRow]]" = OrderedDict()
+_ADAPT_CACHE_MAX = 8
+
+
+def clear_cache() -> None:
+    _ADAPT_CACHE.clear()
+
+
+def _cached_adapt(name: str, adapter, path: str) -> List[UnifiedRow]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return adapter(path)
+    key = (name, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    rows = _ADAPT_CACHE.get(key)
+    if rows is None:
+        rows = adapter(path)
+        _ADAPT_CACHE[key] = rows
+        if len(_ADAPT_CACHE) > _ADAPT_CACHE_MAX:
+            _ADAPT_CACHE.popitem(last=False)
+    else:
+        _ADAPT_CACHE.move_to_end(key)
+    # Callers get their own list; the cached one stays intact
+    return list(rows)
+
+
 def adapt_dataset_for_type(reaction_type: str, path: str) -> List[UnifiedRow]:
     # Only Ullmann in Milestone 1
     if canonicalize(reaction_type).startswith("ullmann"):
-        return adapt_ullmann(path)
+        return _cached_adapt("ullmann", adapt_ullmann, path)
     raise ValueError(f"No adapter for reaction type: {reaction_type}")
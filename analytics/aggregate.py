@@ -2,11 +2,23 @@ from __future__ import annotations
 
 import json
 import os
-from collections import Counter
+import shutil
+from collections import defaultdict
 import csv
-from dataclasses import asdict
+import heapq
+from itertools import product
+from operator import itemgetter
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+
+# Optional fast JSON encoder (falls back to stdlib json)
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
 from .adapters import adapt_dataset_for_type, UnifiedRow
 from .normalization import canonicalize, map_base, map_solvent, map_ligand, map_metal
@@ -23,60 +35,116 @@ def _explode(values: List[str]) -> List[str]:
     return out
 
 
-def _normalize_field(name: str | None, kind: str) -> List[str]:
+_FIELD_MAPPERS = {
+    'base': map_base,
+    'solvent': map_solvent,
+    'ligand': map_ligand,
+    'metal': map_metal,
+}
+
+
+# Raw field values repeat heavily (a few hundred distinct strings per dataset),
+# so memoizing the whole split+map per (raw, kind) skips the token work.
+@lru_cache(maxsize=8192)
+def _normalize_field(name: str | None, kind: str) -> Tuple[str, ...]:
     if not name:
-        return []
+        return ()
     # The dataset has JSON-like arrays in strings; strip brackets/quotes lightly
     s = str(name).strip()
     s = s.strip('[]')
     parts = [p.strip().strip('"').strip("'") for p in s.split(',') if p.strip()]
+    mapper = _FIELD_MAPPERS.get(kind, canonicalize)
     normed: List[str] = []
     for p in parts if parts else [s]:
         if not p:
             continue
-        if kind == 'base':
-            normed.append(map_base(p))
-        elif kind == 'solvent':
-            normed.append(map_solvent(p))
-        elif kind == 'ligand':
-            normed.append(map_ligand(p))
-        elif kind == 'metal':
-            normed.append(map_metal(p))
-        else:
-            normed.append(canonicalize(p))
-    # dedupe
-    seen = set()
-    uniq: List[str] = []
-    for t in normed:
-        if t and t not in seen:
-            seen.add(t)
-            uniq.append(t)
-    return uniq
-
-
-def aggregate_ullmann(rows: List[UnifiedRow]) -> Dict:
-    # Filter rows with Ullmann-like type
-    kept: List[UnifiedRow] = [r for r in rows if 'ullmann' in canonicalize(r.reaction_type)]
+        t = mapper(p)
+        if t:
+            normed.append(t)
+    # order-preserving dedupe
+    return tuple(dict.fromkeys(normed))
+
+
+@dataclass
+class NormalizedRow:
+    """A UnifiedRow with its reagent fields normalized once into interned token tuples."""
+    metals: Tuple[str, ...]
+    ligands: Tuple[str, ...]
+    bases: Tuple[str, ...]
+    solvents: Tuple[str, ...]
+    temperature_c: float | None
+    time_h: float | None
+    yield_pct: float | None
+
+
+def normalize_row(r: UnifiedRow) -> NormalizedRow:
+    return NormalizedRow(
+        metals=_normalize_field(r.metal, 'metal'),
+        ligands=_normalize_field(r.ligand, 'ligand'),
+        bases=_normalize_field(r.base, 'base'),
+        solvents=_normalize_field(r.solvent, 'solvent'),
+        temperature_c=r.temperature_c,
+        time_h=r.time_h,
+        yield_pct=r.yield_pct,
+    )
+
+
+def _stats(arr, low=0.05, high=0.95) -> Dict:
+    """Median/p25/p75 of `arr` after winsorizing to the [low, high] percentiles.
+    Percentiles use the lower order statistic (index int((n-1)*q)); clipping is
+    monotone, so a single sort serves both the bounds and the quartiles."""
+    n = len(arr)
+    if n == 0:
+        return {"median": None, "p25": None, "p75": None, "n": 0}
+    s = sorted(arr)
+    lo_v, p25, p50, p75, hi_v = (s[int((n - 1) * q)] for q in (low, 0.25, 0.5, 0.75, high))
+    return {
+        "median": min(max(p50, lo_v), hi_v),
+        "p25": min(max(p25, lo_v), hi_v),
+        "p75": min(max(p75, lo_v), hi_v),
+        "n": n,
+    }
+
 
-    cnt_metal = Counter()
-    cnt_ligand = Counter()
-    cnt_base = Counter()
-    cnt_solvent = Counter()
+def _count_pairs(counter: Dict[Tuple[str, str], int], xs: Sequence[str], ys: Sequence[str]) -> None:
+    # Most rows carry exactly one token per field; skip the product() loop then
+    if len(xs) == 1 and len(ys) == 1:
+        counter[(xs[0], ys[0])] += 1
+        return
+    for pair in product(xs, ys):
+        counter[pair] += 1
 
-    temps: List[float] = []
-    times: List[float] = []
-    yields: List[float] = []
+
+def _largest(counts: Dict, k: int | None = None) -> List[Tuple]:
+    """(key, count) pairs by descending count; ties keep insertion order.
+    Only an explicit limit `k` trims the list (via heapq.nlargest)."""
+    if k is None:
+        return sorted(counts.items(), key=itemgetter(1), reverse=True)
+    return heapq.nlargest(k, counts.items(), key=itemgetter(1))
+
+
+def aggregate_ullmann(rows: List[UnifiedRow], top_k: int | None = None, co_k: int | None = None) -> Dict:
+    """Ullmann summary; `top_k`/`co_k` cap the top-N and co-occurrence lists (None keeps all)."""
+    # Filter rows with Ullmann-like type
+    # Normalize each kept row once; counting below only touches the token tuples
+    kept: List[NormalizedRow] = [
+        normalize_row(r) for r in rows if 'ullmann' in canonicalize(r.reaction_type)
+    ]
+
+    # Plain defaultdict(int) increments beat Counter.update on the 1-2 token
+    # lists a row yields; ranking happens once at emit time.
+    cnt_metal: Dict[str, int] = defaultdict(int)
+    cnt_ligand: Dict[str, int] = defaultdict(int)
+    cnt_base: Dict[str, int] = defaultdict(int)
+    cnt_solvent: Dict[str, int] = defaultdict(int)
 
     # Co-occurrence counters
-    co_lig_sol = Counter()
-    co_base_sol = Counter()
-    co_cat_lig = Counter()
+    co_lig_sol: Dict[Tuple[str, str], int] = defaultdict(int)
+    co_base_sol: Dict[Tuple[str, str], int] = defaultdict(int)
+    co_cat_lig: Dict[Tuple[str, str], int] = defaultdict(int)
 
     for r in kept:
-        metals = _normalize_field(r.metal, 'metal')
-        ligands = _normalize_field(r.ligand, 'ligand')
-        bases = _normalize_field(r.base, 'base')
-        solvents = _normalize_field(r.solvent, 'solvent')
+        metals, ligands, bases, solvents = r.metals, r.ligands, r.bases, r.solvents
 
         for t in metals:
             cnt_metal[t] += 1
@@ -88,83 +156,29 @@ def aggregate_ullmann(rows: List[UnifiedRow]) -> Dict:
             cnt_solvent[t] += 1
 
         # Co-occurrence updates (cartesian pairs per row)
-        for lg in ligands:
-            for sv in solvents:
-                co_lig_sol[(lg, sv)] += 1
-        for bs in bases:
-            for sv in solvents:
-                co_base_sol[(bs, sv)] += 1
-        for mt in metals:
-            for lg in ligands:
-                co_cat_lig[(mt, lg)] += 1
-
-        if r.temperature_c is not None:
-            temps.append(r.temperature_c)
-        if r.time_h is not None:
-            times.append(r.time_h)
-        if r.yield_pct is not None:
-            yields.append(r.yield_pct)
-
-    def _top(counter: Counter, total: int) -> List[Dict]:
+        _count_pairs(co_lig_sol, ligands, solvents)
+        _count_pairs(co_base_sol, bases, solvents)
+        _count_pairs(co_cat_lig, metals, ligands)
+
+    temps: List[float] = [r.temperature_c for r in kept if r.temperature_c is not None]
+    times: List[float] = [r.time_h for r in kept if r.time_h is not None]
+    yields: List[float] = [r.yield_pct for r in kept if r.yield_pct is not None]
+
+    def _top(counts: Dict[str, int], total: int) -> List[Dict]:
         items = []
         if total <= 0:
             return items
-        for name, count in counter.most_common():
+        for name, count in _largest(counts, top_k):
             pct = count / total
             items.append({"name": name, "count": count, "pct": round(pct, 4)})
         return items
 
     total_rows = len(kept)
 
-    def _pctile(arr: List[float], q: float) -> float | None:
-        if not arr:
-            return None
-        arr_sorted = sorted(arr)
-        idx = int((len(arr_sorted) - 1) * q)
-        return arr_sorted[idx]
-
-    def _winsorize(arr: List[float], low: float = 0.05, high: float = 0.95) -> List[float]:
-        if not arr:
-            return arr
-        s = sorted(arr)
-        lo_v = _pctile(s, low)
-        hi_v = _pctile(s, high)
-        if lo_v is None or hi_v is None:
-            return s
-        out = []
-        for v in s:
-            if v < lo_v:
-                out.append(lo_v)
-            elif v > hi_v:
-                out.append(hi_v)
-            else:
-                out.append(v)
-        return out
-
-    # Winsorize numeric arrays to reduce outlier impact
-    temps_w = _winsorize(temps)
-    times_w = _winsorize(times)
-    yields_w = _winsorize(yields)
-
     numeric_stats = {
-        "temperature_c": {
-            "median": _pctile(temps_w, 0.5),
-            "p25": _pctile(temps_w, 0.25),
-            "p75": _pctile(temps_w, 0.75),
-            "n": len(temps),
-        },
-        "time_h": {
-            "median": _pctile(times_w, 0.5),
-            "p25": _pctile(times_w, 0.25),
-            "p75": _pctile(times_w, 0.75),
-            "n": len(times),
-        },
-        "yield_pct": {
-            "median": _pctile(yields_w, 0.5),
-            "p25": _pctile(yields_w, 0.25),
-            "p75": _pctile(yields_w, 0.75),
-            "n": len(yields),
-        },
+        "temperature_c": _stats(temps),
+        "time_h": _stats(times),
+        "yield_pct": _stats(yields),
     }
 
     summary = {
@@ -184,15 +198,15 @@ def aggregate_ullmann(rows: List[UnifiedRow]) -> Dict:
         "cooccurrence": {
             "ligand_solvent": [
                 {"a": a, "b": b, "count": c, "pct": round(c / total_rows, 4) if total_rows else 0.0}
-                for (a, b), c in sorted(co_lig_sol.items(), key=lambda kv: kv[1], reverse=True)
+                for (a, b), c in _largest(co_lig_sol, co_k)
             ],
             "base_solvent": [
                 {"a": a, "b": b, "count": c, "pct": round(c / total_rows, 4) if total_rows else 0.0}
-                for (a, b), c in sorted(co_base_sol.items(), key=lambda kv: kv[1], reverse=True)
+                for (a, b), c in _largest(co_base_sol, co_k)
             ],
             "catalyst_ligand": [
                 {"a": a, "b": b, "count": c, "pct": round(c / total_rows, 4) if total_rows else 0.0}
-                for (a, b), c in sorted(co_cat_lig.items(), key=lambda kv: kv[1], reverse=True)
+                for (a, b), c in _largest(co_cat_lig, co_k)
             ],
         },
         "numeric_stats": numeric_stats,
@@ -207,43 +221,61 @@ def aggregate_ullmann(rows: List[UnifiedRow]) -> Dict:
     return summary
 
 
+_CSV_BUFFER = 1 << 20
+
+
+def _write_csv(path: str, header: List[str], rows: List[List]) -> None:
+    with open(path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER) as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
 def _write_csvs(summary: Dict, version_dir: str) -> None:
     os.makedirs(version_dir, exist_ok=True)
     # Tops
+    top_cols = ["name", "count", "pct"]
     for kind in ("metals", "ligands", "bases", "solvents"):
         rows = (summary.get("top", {}) or {}).get(kind, [])
         path = os.path.join(version_dir, f"top_{kind}.csv")
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["name", "count", "pct"])
-            for item in rows:
-                w.writerow([item.get("name"), item.get("count"), item.get("pct")])
+        _write_csv(path, top_cols, [[item.get(k) for k in top_cols] for item in rows])
 
     # Co-occurrence
     co = summary.get("cooccurrence", {}) or {}
+    co_cols = ["a", "b", "count", "pct"]
     for cname in ("ligand_solvent", "base_solvent", "catalyst_ligand"):
         rows = co.get(cname, [])
         path = os.path.join(version_dir, f"co_{cname}.csv")
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["a", "b", "count", "pct"])
-            for item in rows:
-                w.writerow([item.get("a"), item.get("b"), item.get("count"), item.get("pct")])
+        _write_csv(path, co_cols, [[item.get(k) for k in co_cols] for item in rows])
 
     # Numeric stats
     nums = summary.get("numeric_stats", {}) or {}
+    stat_cols = ["median", "p25", "p75", "n"]
     path = os.path.join(version_dir, "numeric_stats.csv")
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["metric", "median", "p25", "p75", "n"])
-        for metric, stats in nums.items():
-            w.writerow([
-                metric,
-                (stats or {}).get("median"),
-                (stats or {}).get("p25"),
-                (stats or {}).get("p75"),
-                (stats or {}).get("n"),
-            ])
+    _write_csv(
+        path,
+        ["metric"] + stat_cols,
+        [[metric] + [(stats or {}).get(k) for k in stat_cols] for metric, stats in nums.items()],
+    )
+
+
+def _dumps_summary(summary: Dict) -> bytes:
+    """Serialize a summary as indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(summary, indent=2).encode("utf-8")
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Point dst at src's contents: hardlink when possible, else copy. Atomic on replace."""
+    tmp = dst + ".tmp"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
 
 
 def _trim_summary(summary: Dict, top_limit: int | None = None, co_limit: int | None = None) -> Dict:
@@ -271,9 +303,13 @@ def run_and_export_ullmann(out_dir: str, *, write_json: bool = True, write_csv:
         raise FileNotFoundError("Ullmann dataset not found")
 
     rows = adapt_dataset_for_type("Ullmann", path)
-    summary = aggregate_ullmann(rows)
-    # Apply optional trimming for outputs
-    summary = _trim_summary(summary, top_limit=top_limit, co_limit=co_limit)
+    # Limits are applied while ranking, so no trimmed copy of the summary is needed
+    # (like _trim_summary, a limit <= 0 keeps everything)
+    summary = aggregate_ullmann(
+        rows,
+        top_k=top_limit if top_limit and top_limit > 0 else None,
+        co_k=co_limit if co_limit and co_limit > 0 else None,
+    )
 
     # Versioned folder and latest.json
     base_out = os.path.join(out_dir, "data", "analytics", "Ullmann")
@@ -282,17 +318,18 @@ def run_and_export_ullmann(out_dir: str, *, write_json: bool = True, write_csv:
     os.makedirs(version_dir, exist_ok=True)
 
     # Write JSON and/or CSVs
+    summary_path = os.path.join(version_dir, "summary.json")
     if write_json:
-        with open(os.path.join(version_dir, "summary.json"), "w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2)
+        with open(summary_path, "wb") as f:
+            f.write(_dumps_summary(summary))
     if write_csv:
         _write_csvs(summary, version_dir)
 
-    # Update latest.json (reflects same trimmed view when limits are used)
+    # Update latest.json (reflects same trimmed view when limits are used);
+    # it shares summary.json's bytes rather than being written a second time
     latest_path = os.path.join(base_out, "latest.json")
     if write_json:
-        with open(latest_path, "w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2)
+        _link_or_copy(summary_path, latest_path)
 
     return latest_path
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
+import sys
 import unicodedata
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
 # Simple in-module synonym maps; can be upgraded to YAML files later
@@ -45,8 +47,12 @@ METAL_SYNONYMS = {
 }
 
 _RE_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_RE_FLOAT = re.compile(r"([\-+]?[0-9]*\.?[0-9]+)")
+_RE_EQ = re.compile(r"\beq\b")
+_RE_MIX_SPLIT = re.compile(r"[/:,+;\\]|\s+and\s+")
 
 
+@lru_cache(maxsize=4096)
 def canonicalize(token: str) -> str:
     """Lowercase, strip punctuation/whitespace, normalize unicode.
     Also collapse runs of non-alphanum to a single space and then remove spaces.
@@ -57,18 +63,26 @@ def canonicalize(token: str) -> str:
     s = s.replace("µ", "u")
     s = _RE_NON_ALNUM.sub(" ", s)
     s = "".join(s.split())
-    return s
+    # Interned so counter/dict keys built from tokens share one object
+    return sys.intern(s)
 
 
-def synonym_lookup(tok: str, table: Dict[str, List[str]]) -> str:
-    ctok = canonicalize(tok)
+def build_synonym_index(table: Dict[str, List[str]]) -> Dict[str, str]:
+    """Invert a synonym table into {canonical variant: key}.
+
+    Earlier entries win on collisions, matching a first-hit linear scan.
+    """
+    index: Dict[str, str] = {}
     for k, vals in table.items():
-        if ctok == k:
-            return k
+        index.setdefault(canonicalize(k), k)
         for v in vals:
-            if canonicalize(v) == ctok:
-                return k
-    return ctok
+            index.setdefault(canonicalize(v), k)
+    return index
+
+
+def synonym_lookup(tok: str, index: Dict[str, str]) -> str:
+    ctok = canonicalize(tok)
+    return index.get(ctok, ctok)
 
 
 def normalize_mixture(text: str) -> List[str]:
@@ -77,7 +91,7 @@ def normalize_mixture(text: str) -> List[str]:
     """
     if not text:
         return []
-    parts = re.split(r"[\/:,+]|;|\\|\s+and\s+", text)
+    parts = _RE_MIX_SPLIT.split(text)
     return [canonicalize(p) for p in parts if p.strip()]
 
 
@@ -92,7 +106,7 @@ def parse_numeric(text: str) -> Tuple[float | None, str | None]:
     s = s.replace(",", ".")
     # quick lower for unit detection
     slow = s.casefold()
-    m = re.search(r"([\-+]?[0-9]*\.?[0-9]+)", slow)
+    m = _RE_FLOAT.search(slow)
     if not m:
         return None, None
     val = float(m.group(1))
@@ -104,24 +118,30 @@ def parse_numeric(text: str) -> Tuple[float | None, str | None]:
         unit = "c"
     elif "h" in slow or "hr" in slow or slow.endswith(" hours"):
         unit = "h"
-    elif "equiv" in slow or re.search(r"\beq\b", slow):
+    elif "equiv" in slow or _RE_EQ.search(slow):
         unit = "equiv"
     return val, unit
 
 
+_BASE_INDEX = build_synonym_index(BASE_SYNONYMS)
+_SOLVENT_INDEX = build_synonym_index(SOLVENT_SYNONYMS)
+_LIGAND_INDEX = build_synonym_index(LIGAND_SYNONYMS)
+_METAL_INDEX = build_synonym_index(METAL_SYNONYMS)
+
+
 def map_base(name: str) -> str:
-    return synonym_lookup(name, BASE_SYNONYMS)
+    return synonym_lookup(name, _BASE_INDEX)
 
 
 def map_solvent(name: str) -> str:
     # Fix common spacing issues first
     name = name.replace("DMS O", "DMSO")
-    return synonym_lookup(name, SOLVENT_SYNONYMS)
+    return synonym_lookup(name, _SOLVENT_INDEX)
 
 
 def map_ligand(name: str) -> str:
-    return synonym_lookup(name, LIGAND_SYNONYMS)
+    return synonym_lookup(name, _LIGAND_INDEX)
 
 
 def map_metal(name: str) -> str:
-    return synonym_lookup(name, METAL_SYNONYMS)
+    return synonym_lookup(name, _METAL_INDEX)
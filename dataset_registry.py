@@ -9,6 +9,9 @@ and datasets are added.
 Usage:
     from dataset_registry import resolve_dataset_path
     path = resolve_dataset_path(reaction_type, base_dir=__file__dir__)
+
+Resolution results are memoized per process; call `clear_cache()` after
+adding or moving dataset files at runtime.
 """
 
 from __future__ import annotations
@@ -56,6 +59,27 @@ def _candidate_paths(base_dir: str, basename: str) -> List[str]:
     ]
 
 
+# (base_dir, basename) -> first existing candidate path; hits only
+_PATH_CACHE: Dict[tuple[str, str], str] = {}
+
+
+def _find_basename(base_dir: str, basename: str) -> Optional[str]:
+    key = (base_dir, basename)
+    hit = _PATH_CACHE.get(key)
+    if hit is not None:
+        return hit
+    for p in _candidate_paths(base_dir, basename):
+        if os.path.exists(p):
+            _PATH_CACHE[key] = p
+            return p
+    return None
+
+
+def clear_cache() -> None:
+    """Forget memoized resolutions (e.g. in tests or after datasets change)."""
+    _PATH_CACHE.clear()
+
+
 def resolve_dataset_path(reaction_type: Optional[str], base_dir: Optional[str] = None) -> Optional[str]:
     """Resolve dataset path for a given reaction type.
 
@@ -81,18 +105,17 @@ def resolve_dataset_path(reaction_type: Optional[str], base_dir: Optional[str] =
 
     # Direct match
     if label_base in DATASET_MAP:
-        basename = DATASET_MAP[label_base]
-        for p in _candidate_paths(base_dir, basename):
-            if os.path.exists(p):
-                return p
+        p = _find_basename(base_dir, DATASET_MAP[label_base])
+        if p:
+            return p
 
     # Keyword fallback (case-insensitive contains)
     low = label.lower()
     for key, basename in KEYWORD_FALLBACKS:
         if key in low:
-            for p in _candidate_paths(base_dir, basename):
-                if os.path.exists(p):
-                    return p
+            p = _find_basename(base_dir, basename)
+            if p:
+                return p
 
     return None
 
@@ -103,8 +126,7 @@ def list_available_datasets(base_dir: Optional[str] = None) -> Dict[str, str]:
         base_dir = os.path.dirname(__file__)
     found: Dict[str, str] = {}
     for k, basename in DATASET_MAP.items():
-        for p in _candidate_paths(base_dir, basename):
-            if os.path.exists(p):
-                found[k] = p
-                break
+        p = _find_basename(base_dir, basename)
+        if p:
+            found[k] = p
     return found
@@ -6,10 +6,232 @@ for comprehensive reaction condition predictions.
 
 import os
 import sys
+import copy
+import csv
+import hashlib
+import heapq
 import json
-from typing import Dict, List, Optional, Tuple
+import logging
+import math
+import pickle
+import tempfile
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 import re
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Optional fast JSON decoder (falls back to stdlib json)
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# Optional columnar CSV reader for the dataset evidence scan (falls back to stdlib csv)
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pacsv  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    pacsv = None  # type: ignore
+
+# Optional Aho-Corasick matcher for SMILES token counting (falls back to str.count)
+try:
+    import ahocorasick  # type: ignore
+except Exception:  # pragma: no cover
+    ahocorasick = None  # type: ignore
+
+# Literal SMILES tokens used by the reaction-type heuristics. None of them
+# overlaps itself, so automaton hit counts equal str.count() per token.
+_SMILES_TOKENS = ('Br', 'Cl', 'I', 'B(O)', 'C=O', 'C(=O)', '=', '#', 'c', 'C')
+_NITROGEN_RE = re.compile(r'N[^a-z]')  # Nitrogen not part of aromatic system
+
+_TOKEN_AUTOMATON = None
+if ahocorasick is not None:
+    _TOKEN_AUTOMATON = ahocorasick.Automaton()
+    for _tok in _SMILES_TOKENS:
+        _TOKEN_AUTOMATON.add_word(_tok, _tok)
+    _TOKEN_AUTOMATON.make_automaton()
+
+
+@lru_cache(maxsize=1024)
+def _token_counts(smiles: str) -> Dict[str, int]:
+    """Occurrences of each _SMILES_TOKENS entry in `smiles` (shared, read-only).
+
+    Cached so the classifier cascade scans each reactant/product side once.
+    """
+    if _TOKEN_AUTOMATON is not None:
+        counts = dict.fromkeys(_SMILES_TOKENS, 0)
+        for _end, tok in _TOKEN_AUTOMATON.iter(smiles):
+            counts[tok] += 1
+        return counts
+    return {tok: smiles.count(tok) for tok in _SMILES_TOKENS}
+
+
+def _unsaturation(smiles: str) -> int:
+    """Explicit unsaturation in a SMILES string: '=' counts 1, '#' counts 2."""
+    c = _token_counts(smiles)
+    return c['='] + 2 * c['#']
+
+# GUI reaction labels -> enhanced system types, first matching substring wins.
+# Specific families come before the generic "Coupling" catch-all (Ullmann
+# labels also say "Coupling").
+_REACTION_TYPE_RULES = (
+    ("Ullmann", "Ullmann"),
+    ("Hydrogenation", "Hydrogenation"),
+    ("Carbonylation", "Carbonylation"),
+    ("C-H Activation", "C-H_Activation"),
+    ("Buchwald", "Cross-Coupling"),
+    ("Coupling", "Cross-Coupling"),
+)
+# Whole-label matches only: named oxidations (Swern, TEMPO, ...) keep auto-detect
+_REACTION_TYPE_EXACT = {"Oxidation": "C-H_Activation"}
+
+
+@lru_cache(maxsize=256)
+def _map_reaction_type(gui_type: str) -> Optional[str]:
+    """Map GUI reaction types to our enhanced system types"""
+    # Strip trailing metal tags like " (Pd)" or " (Cu)" from GUI label
+    base_gui = gui_type.rsplit(' (', 1)[0] if gui_type.endswith(')') else gui_type
+    if base_gui in _REACTION_TYPE_EXACT:
+        return _REACTION_TYPE_EXACT[base_gui]
+    for needle, mapped in _REACTION_TYPE_RULES:
+        if needle in base_gui:
+            return mapped
+    return None
+
+
+def _is_cross_coupling_pattern(reactants: str, products: str) -> bool:
+    """Check if reaction pattern matches cross-coupling"""
+    # Look for halogens, boronic acids, etc.
+    c = _token_counts(reactants)
+    if not (c['Br'] or c['Cl'] or c['I']):
+        return False
+    return bool(c['B(O)']) or _NITROGEN_RE.search(reactants) is not None
+
+
+def _is_hydrogenation_pattern(reactants: str, products: str) -> bool:
+    """Check if reaction pattern matches hydrogenation"""
+    # Look for reduction of double bonds, carbonyls, etc.
+    # Simple heuristic: check for decrease in unsaturation
+    reactant_unsat = _unsaturation(reactants)
+    if not reactant_unsat:
+        return False
+    return _unsaturation(products) < reactant_unsat
+
+
+def _is_carbonylation_pattern(reactants: str, products: str) -> bool:
+    """Check if reaction pattern matches carbonylation"""
+    # Look for CO insertion patterns
+    rc, pc = _token_counts(reactants), _token_counts(products)
+    return pc['C=O'] + pc['C(=O)'] > rc['C=O'] + rc['C(=O)']
+
+
+def _is_ch_activation_pattern(reactants: str, products: str) -> bool:
+    """Check if reaction pattern matches C-H activation"""
+    # Look for aromatic substitution patterns
+    rc, pc = _token_counts(reactants), _token_counts(products)
+    aromatic_reactants = rc['c'] + rc['C']
+    aromatic_products = pc['c'] + pc['C']
+
+    # Simple heuristic: more aromatic complexity in products
+    return aromatic_products > aromatic_reactants * 1.2
+
+
+@lru_cache(maxsize=4096)
+def _analyze_reaction_type(reaction_smiles: str, suggested_type: Optional[str] = None) -> str:
+    """Reaction type for (SMILES, GUI label); pure, so memoized across engine instances."""
+    # If user specified a type, try to map it
+    if suggested_type and suggested_type not in ("Auto-detect", "Auto detect reaction type"):
+        mapped_type = _map_reaction_type(suggested_type)
+        if mapped_type:
+            return mapped_type
+
+    # Auto-detect based on SMILES pattern analysis
+    reactants, sep, products = reaction_smiles.partition(">>")
+    if not sep:
+        return "General Organic Reaction"
+
+    # Look for common patterns
+    if _is_cross_coupling_pattern(reactants, products):
+        return "Cross-Coupling"
+    elif _is_hydrogenation_pattern(reactants, products):
+        return "Hydrogenation"
+    elif _is_carbonylation_pattern(reactants, products):
+        return "Carbonylation"
+    elif _is_ch_activation_pattern(reactants, products):
+        return "C-H_Activation"
+    else:
+        return "Cross-Coupling"  # Default to cross-coupling for organometallic reactions
+
+
+@lru_cache(maxsize=128)
+def _warn_once(message: str) -> None:
+    """Log a warning the first time this exact message is seen (repeat requests stay quiet)."""
+    logger.warning(message)
+
+
+def _could_be_buchwald(reaction_smiles: str, gui_lower: str) -> bool:
+    """Cheap necessary condition for the base engine's Buchwald-Hartwig recommender.
+
+    It claims a reaction by label (`gui_lower` is the already-lowered GUI type), or
+    by halide + nitrogen on both sides; without 'N' in the reactants the base pass
+    can only return its general fallback.
+    """
+    if 'buchwald' in gui_lower:
+        return True
+    return 'N' in reaction_smiles.partition('>>')[0]
+
+
+def _extract_priors(summary: dict, kind: str) -> Optional[dict]:
+    """name -> pct (0..1) from the summary's top list for `kind`; None when absent or malformed."""
+    try:
+        top = ((summary or {}).get('top') or {}).get(kind) or []
+        if not top:
+            return None
+        pri = {}
+        for item in top:
+            nm = str(item.get('name') or '').strip()
+            pct = float(item.get('pct') or 0.0)
+            if not nm or pct <= 0:
+                continue
+            pri[nm] = pct
+        return pri or None
+    except (AttributeError, TypeError, ValueError):
+        # unexpected summary shape or non-numeric pct
+        return None
+
+
+def _canon_prior_map(pri: Optional[dict], kind: str) -> Dict[str, float]:
+    """Key an _extract_priors() mapping by the canonical form used for `kind`."""
+    return { _canon_name(k, kind): float(v) for k, v in (pri or {}).items() }
+
+
+@lru_cache(maxsize=64)
+def _summary_priors(path: str, mtime_ns: int, kind: str) -> Tuple[Optional[dict], Dict[str, float]]:
+    """_extract_priors and _canon_prior_map for one summary version; shared, do not mutate."""
+    pri = _extract_priors(_read_analytics_json(path, mtime_ns), kind)
+    return pri, _canon_prior_map(pri, kind)
+
+
+@lru_cache(maxsize=16)
+def _read_analytics_json(path: str, mtime_ns: int) -> dict:
+    """Parse an analytics summary; mtime_ns is part of the key so edits re-parse.
+
+    The returned dict is shared between callers and must be treated as read-only.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
 
 # Ensure project root (containing 'reagents' package) is on sys.path
 _HERE = os.path.dirname(__file__)
@@ -30,22 +252,841 @@ try:
     )
     ENHANCED_REAGENTS_AVAILABLE = True
 except ImportError as e:
-    print(f"Warning: Enhanced reagent systems not available: {e}")
+    logger.warning("Enhanced reagent systems not available: %s", e)
     ENHANCED_REAGENTS_AVAILABLE = False
 
+# Base recommendations are optional on top of ligands/solvents
+try:
+    from reagents.base import recommend_bases_for_reaction
+except ImportError:
+    recommend_bases_for_reaction = None
+
 # Try to import existing recommendation engine
 try:
     from recommendation_engine import RecommendationEngine as BaseRecommendationEngine
     BASE_ENGINE_AVAILABLE = True
 except ImportError:
     BASE_ENGINE_AVAILABLE = False
-    print("Base recommendation engine not available, using enhanced-only mode")
+    logger.warning("Base recommendation engine not available, using enhanced-only mode")
+
+
+# Reagent database sizes for dataset_info; the JSON databases are loaded once per process
+@lru_cache(maxsize=1)
+def _ligand_count() -> int:
+    return len(create_ligand_dataframe())
+
+
+@lru_cache(maxsize=1)
+def _solvent_count() -> int:
+    return len(create_solvent_dataframe())
+
+
+# Reagent recommendations depend only on the reaction type, thresholds and the
+# evidence weights, so repeated GUI requests reuse them. Evidence is passed as an
+# items tuple (insertion order kept: the recommenders break ties by it). Callers
+# get deep copies since the results are filtered and re-scored downstream.
+@lru_cache(maxsize=64)
+def _cached_recommend_ligands(reaction_type: str, top_n: int, min_compat: float,
+                              evidence_key: Optional[Tuple[Tuple[str, float], ...]]) -> List[Dict]:
+    return recommend_ligands_for_reaction(
+        reaction_type=reaction_type,
+        top_n=top_n,
+        min_compatibility=min_compat,
+        evidence_ligands=dict(evidence_key) if evidence_key else None
+    )
+
+
+@lru_cache(maxsize=64)
+def _cached_recommend_solvents(reaction_type: str, top_n: int, min_compat: float,
+                               evidence_key: Optional[Tuple[Tuple[str, float], ...]]) -> List[Dict]:
+    return recommend_solvents_for_reaction(
+        reaction_type=reaction_type,
+        top_n=top_n,
+        min_compatibility=min_compat,
+        evidence_solvents=dict(evidence_key) if evidence_key else None
+    )
+
+
+def _evidence_key(evidence: Optional[Dict[str, float]]) -> Optional[Tuple[Tuple[str, float], ...]]:
+    return tuple(evidence.items()) if evidence else None
+
+
+@lru_cache(maxsize=64)
+def _property_alternatives(reaction_type: str) -> Dict:
+    alternatives = {}
+
+    # Get budget-friendly options
+    budget_ligands = get_reaction_specific_ligands(
+        reaction_type=reaction_type,
+        property_preferences={'price_category_max': 3}
+    )
+    if budget_ligands:
+        alternatives['budget_friendly_ligands'] = budget_ligands[:3]
+
+    # Get low BP solvents for easy removal
+    low_bp_solvents = get_reaction_specific_solvents(
+        reaction_type=reaction_type,
+        property_preferences={'bp_max': 100}
+    )
+    if low_bp_solvents:
+        alternatives['low_boiling_solvents'] = low_bp_solvents[:3]
+
+    # Get green/sustainable options
+    green_solvents = get_reaction_specific_solvents(
+        reaction_type=reaction_type,
+        property_preferences={'polarity_min': 3, 'bp_max': 150}
+    )
+    if green_solvents:
+        alternatives['green_solvents'] = green_solvents[:3]
+
+    return alternatives
+
+
+@lru_cache(maxsize=1)
+def _solvent_abbreviations() -> Mapping[str, str]:
+    """Solvent name (and abbreviation) -> abbreviation from the solvent database."""
+    abbrev: Dict[str, str] = {}
+    try:
+        sdf = create_solvent_dataframe()
+        for nm, ab in zip(sdf['Solvent'], sdf['Abbreviation']):
+            nm = nm.strip() if isinstance(nm, str) else ''
+            ab = ab.strip() if isinstance(ab, str) else ''
+            if nm:
+                abbrev[nm] = ab
+            if ab and ab not in abbrev:
+                abbrev[ab] = ab
+    except Exception:
+        pass
+    return MappingProxyType(abbrev)
+
+
+_REACTION_TYPES_SUPPORTED = ('Cross-Coupling', 'Hydrogenation', 'Metathesis', 'C-H_Activation', 'Carbonylation')
+
+
+@lru_cache(maxsize=1)
+def _quarc_agents_fn():
+    """QUARC adapter entry point, imported on first use only (None when unavailable)."""
+    try:
+        from integration.quarc_oss_adapter import get_agents_for_engine  # type: ignore
+    except Exception:
+        return None
+    return get_agents_for_engine
+
+
+# ===== Analytics prior name canonicalization (per top-list kind) =====
+def _canon_prior_solvent(name: str) -> str:
+    s_low = (name or '').strip().lower().replace(' ', '')
+    # special-case DMSO often appears as 'dms o' canonical in analytics
+    if s_low in ('dmso', 'dms o', 'dimethylsulfoxide'):
+        return 'dms o'
+    return s_low
+
+
+def _canon_prior_base(name: str) -> str:
+    s = (name or '').strip()
+    # favor formula inside parentheses if present
+    if '(' in s and ')' in s:
+        inner = s[s.rfind('(')+1:s.rfind(')')].strip()
+        if inner:
+            s = inner
+    return s.lower().replace(' ', '')
+
+
+def _canon_prior_ligand(name: str) -> str:
+    return (name or '').strip().casefold()
+
+
+def _canon_evidence_base(name: str) -> str:
+    # Legacy dataset-evidence boost: like bases, but keeps internal spaces
+    s = (name or '').strip()
+    if '(' in s and ')' in s:
+        inner = s[s.rfind('(')+1:s.rfind(')')].strip()
+        if inner:
+            s = inner
+    return s.lower()
+
+
+_CANONICALIZERS = {
+    'solvents': _canon_prior_solvent,
+    'bases': _canon_prior_base,
+    'ligands': _canon_prior_ligand,
+    'evidence_bases': _canon_evidence_base,
+}
+
+# prior kind -> candidate name field
+_PRIOR_KINDS = {
+    'solvents': 'solvent',
+    'bases': 'base',
+    'ligands': 'ligand',
+}
+
+
+@lru_cache(maxsize=4096)
+def _canon_name(name: str, kind: str) -> str:
+    """Canonical lookup key for a reagent name; candidate names repeat across calls."""
+    return _CANONICALIZERS[kind](name)
+
+
+# ===== Dataset evidence index (shared by the _harvest_evidence_* methods) =====
+_DATASET_DIR = os.path.join(_ROOT, 'data', 'reaction_dataset')
+_EVIDENCE_BASE_TOKENS = ('k2co3', 'cs2co3', 'k3po4', 'kotbu', 'naotbu', 'na2co3', 'koh', 'tbuok', 'ko-tbu', 'triethylamine', 'et3n')
+# Base tokens are matched in one pass: Aho-Corasick when available, else one
+# literal regex alternation (still a single C-level scan instead of 11 `in` tests)
+_BASE_TOKEN_RE = re.compile('|'.join(map(re.escape, _EVIDENCE_BASE_TOKENS)))
+_BASE_TOKEN_AUTOMATON = None
+if ahocorasick is not None:
+    _BASE_TOKEN_AUTOMATON = ahocorasick.Automaton()
+    for _tok in _EVIDENCE_BASE_TOKENS:
+        _BASE_TOKEN_AUTOMATON.add_word(_tok, _tok)
+    _BASE_TOKEN_AUTOMATON.make_automaton()
+
+
+def _has_base_token(low: str) -> bool:
+    """True when the lower-cased text contains any _EVIDENCE_BASE_TOKENS entry."""
+    if _BASE_TOKEN_AUTOMATON is not None:
+        return next(_BASE_TOKEN_AUTOMATON.iter(low), None) is not None
+    return _BASE_TOKEN_RE.search(low) is not None
+
+
+# Only these columns feed the evidence index
+_EVIDENCE_COLUMNS = ('ReactionType', 'Ligand', 'Solvent', 'SOLName', 'Reagent', 'ReagentRaw', 'RGTName', 'Base')
+
+
+def _name_only(tok: str) -> str:
+    """Collapse a 'Name|CAS' token to its name (or CAS when the name is empty)."""
+    if tok is None:
+        return ''
+    txt = str(tok)
+    if '|' in txt:
+        left, right = txt.split('|', 1)
+        return left.strip() or right.strip() or ''
+    return txt.strip()
+
+
+def _split_listlike(raw: str) -> List[str]:
+    """Crude parse of list-like cells such as '["A|123","B"]' into items."""
+    s = str(raw).strip().strip('[]').replace('"', '').replace("'", '')
+    parts = [p.strip() for p in s.split(',') if p.strip()]
+    return parts if parts else ([s] if s else [])
+
+
+def _parse_listlike(val: str) -> List[str]:
+    """Items of a similarity-hit cell: a JSON list when it parses, else a crude comma split."""
+    if not val:
+        return []
+    s = str(val).strip()
+    # Try JSON list first
+    if s.startswith('[') and s.endswith(']'):
+        try:
+            arr = json.loads(s)
+            return [str(x).strip() for x in arr if str(x).strip()]
+        except Exception:
+            pass
+    # Fallback: strip quotes/brackets and split by comma
+    s2 = s.strip('[]').replace('"', '').replace("'", '')
+    return [p.strip() for p in s2.split(',') if p.strip()]
+
+
+@lru_cache(maxsize=8192)
+def _hit_cell_names(val: str) -> Tuple[str, ...]:
+    """Names in a similarity-hit cell ('Name|CAS' tokens collapsed), cached per cell text."""
+    return tuple(_name_only(item) for item in _parse_listlike(val))
+
+
+# Base alias normalization for similarity hits
+_BASE_ALIAS = MappingProxyType({
+    'potassium carbonate (k2co3)': 'K2CO3',
+    'cesium carbonate (cs2co3)': 'Cs2CO3',
+    'tripotassium phosphate (k3po4)': 'K3PO4',
+    'potassium tert-butoxide (kotbu)': 'KOtBu',
+    'sodium tert-butoxide (naotbu)': 'NaOtBu',
+    'sodium carbonate (na2co3)': 'Na2CO3',
+    'potassium hydroxide (koh)': 'KOH',
+    'triethylamine': 'Et3N',
+})
+
+
+@lru_cache(maxsize=4096)
+def _canon_base(nm: str) -> str:
+    """Canonical display name for a base token from a similarity hit."""
+    s = (nm or '').strip()
+    low = s.lower()
+    # Pull formula inside parentheses when present
+    if '(' in s and ')' in s:
+        inner = s[s.rfind('(')+1:s.rfind(')')].strip()
+        if inner:
+            low = inner.lower()
+    low = low.replace(' ', '')
+    return _BASE_ALIAS.get(low, s)
+
+
+# CAS-only tokens (e.g. 108-88-3) stand in for a missing reagent name
+_CAS_ONLY_RE = re.compile(r'^\d{2,7}-\d{2}-\d$')
+
+
+def _dataset_files(data_dir: str) -> List[os.DirEntry]:
+    """CSV/TSV files in data_dir, in directory order."""
+    with os.scandir(data_dir) as it:
+        return [e for e in it if e.name[-4:].lower() in ('.csv', '.tsv') and e.is_file()]
+
+
+def _dataset_signature(data_dir: str) -> Tuple:
+    """(name, mtime_ns, size) of each dataset file, in directory order."""
+    sig = []
+    for entry in _dataset_files(data_dir):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        sig.append((entry.name, st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def _iter_dataset_rows(path: str, columns: Tuple[str, ...]):
+    """Yield one tuple of `columns` per row; missing or empty cells come back as None.
+
+    Uses pyarrow's parser (reading only `columns`) when available and falls back
+    to the tolerant stdlib reader for files pyarrow rejects (e.g. ragged rows).
+    """
+    delimiter = '\t' if path[-4:].lower() == '.tsv' else ','
+    if pacsv is not None:
+        try:
+            tbl = pacsv.read_csv(
+                path,
+                parse_options=pacsv.ParseOptions(delimiter=delimiter),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=list(columns),
+                    include_missing_columns=True,
+                    column_types={c: pa.string() for c in columns},
+                    null_values=[''],
+                    strings_can_be_null=True,
+                ),
+            )
+        except pa.ArrowInvalid:
+            pass
+        else:
+            yield from zip(*(tbl.column(c).to_pylist() for c in columns))
+            return
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        # Column positions (last duplicate wins, as with DictReader); None when absent
+        pos = {name: i for i, name in enumerate(header)}
+        idx = [pos.get(c) for c in columns]
+        for row in reader:
+            if not row:
+                continue  # DictReader skips blank lines too
+            n = len(row)
+            yield tuple((row[i] or None) if i is not None and i < n else None for i in idx)
+
+
+_EvidenceIndex = Dict[str, Dict[str, Tuple[Counter, Dict[str, int]]]]
+_FileEvidence = Dict[str, Dict[str, Tuple[Counter, Dict[str, Tuple[int, int]]]]]
+
+# Dataset ReactionType families folded into an engine target label
+_CROSS_COUPLING_SUBTYPES = ('buchwald', 'buchwald-hartwig', 'suzuki', 'heck', 'sonogashira', 'stille', 'negishi', 'chan-lam')
+_AMIDE_SYNONYMS = ('amide', 'amidation', 'amide coupling', 'carboxyl activation')
+
+
+@lru_cache(maxsize=1024)
+def _reaction_types_match(row_type: str, target: str) -> bool:
+    """Case-insensitive ReactionType vs target match; each distinct pair is folded and compared once."""
+    rt = row_type.strip().casefold()
+    tgt = target.strip().casefold()
+    if not rt or not tgt:
+        return False
+    if rt == tgt:
+        return True
+    # Cross-Coupling umbrella should include common subfamilies
+    if tgt == 'cross-coupling':
+        return any(s in rt for s in _CROSS_COUPLING_SUBTYPES)
+    # Amide formation synonyms
+    if 'amide' in tgt:
+        return any(s in rt for s in _AMIDE_SYNONYMS)
+    # Ullmann: accept minor variations
+    if 'ullmann' in tgt:
+        return 'ullmann' in rt
+    return False
+
+
+def _intern_name(name: str) -> str:
+    """Intern short reagent names so every cached index shares one copy; skip free text."""
+    return sys.intern(name) if len(name) < 64 else name
+
+
+def _cell_names(text: str, bases_only: bool) -> Tuple[str, ...]:
+    """Names in a list-like dataset cell; with bases_only, just items containing a base token."""
+    return tuple(
+        _intern_name(_name_only(it)) for it in _split_listlike(text)
+        if not bases_only or _has_base_token(it.lower())
+    )
+
+
+@lru_cache(maxsize=32)
+def _scan_evidence_file(path: str, mtime_ns: int, size: int) -> _FileEvidence:
+    """Evidence from one dataset file: ReactionType -> kind -> (counts, first_seen).
+
+    kind is 'ligand', 'solvent' or 'base'. first_seen maps each name to a sort
+    key (within this file) of its first occurrence in that group. Cached per
+    (path, mtime_ns, size), so only files that changed are re-scanned. The result
+    is shared; callers must not mutate it.
+    """
+    # Rows only tally raw cell text: ReactionType -> kind -> text -> [count, first row ordinal].
+    # Cell values repeat heavily, so each distinct one is parsed and counted in bulk afterwards.
+    cells_by_type: Dict[str, Dict[str, Dict[str, list]]] = {}
+    seq = 0
+
+    def _add(group: Dict[str, Dict[str, list]], kind: str, text: str) -> None:
+        nonlocal seq
+        cells = group.get(kind)
+        if cells is None:
+            cells = group[kind] = {}
+        entry = cells.get(text)
+        if entry is None:
+            entry = cells[text] = [0, seq]
+            seq += 1
+        entry[0] += 1
+
+    try:
+        for rtype, lig_raw, sol_raw, sol_name, reagent, reagent_raw, rgt_name, base in _iter_dataset_rows(path, _EVIDENCE_COLUMNS):
+            rtype = (rtype or '').strip()
+            if not rtype:
+                continue
+            group = cells_by_type.setdefault(rtype, {})
+            if lig_raw:
+                _add(group, 'ligand', lig_raw)
+            sol_raw = sol_raw or sol_name
+            if sol_raw:
+                _add(group, 'solvent', sol_raw)
+            # New column name Reagent (with roles in ReagentRole)
+            for text in (reagent or reagent_raw, rgt_name, base):
+                if text:
+                    _add(group, 'base', text)
+    except (OSError, ValueError, csv.Error):
+        # bad (unreadable, mis-encoded or malformed) file: keep what was read
+        pass
+
+    index: _FileEvidence = {}
+    for rtype, group in cells_by_type.items():
+        for kind, cells in group.items():
+            counts: Counter = Counter()
+            first: Dict[str, Tuple[int, int]] = {}
+            for text, (n, cell_seq) in cells.items():
+                names = _cell_names(text, kind == 'base')
+                for pos, name in enumerate(names):
+                    counts[name] += n
+                    if name not in first:
+                        first[name] = (cell_seq, pos)
+            if counts:
+                index.setdefault(rtype, {})[kind] = (counts, first)
+    return index
+
+
+@lru_cache(maxsize=1)
+def _build_evidence_index(data_dir: str, signature: Tuple) -> _EvidenceIndex:
+    """Merge the per-file evidence: ReactionType -> kind -> (counts, first_seen).
+
+    first_seen is a global ordinal of each name's first occurrence in that group
+    across the files in signature order, so merged counts can be tie-broken in
+    dataset order.
+    """
+    keys = [(os.path.join(data_dir, fname), mtime_ns, size) for fname, mtime_ns, size in signature]
+    # pyarrow already parses each file on its own thread pool
+    parts = [_scan_evidence_file(*key) for key in keys]
+
+    index: _EvidenceIndex = {}
+    seq = 0
+    for part in parts:
+        # Replay this file's first occurrences in file order to extend the global ordinals
+        events = []
+        for rtype, group in part.items():
+            merged_group = index.setdefault(rtype, {})
+            for kind, (counts, first) in group.items():
+                bucket = merged_group.get(kind)
+                if bucket is None:
+                    bucket = merged_group[kind] = (Counter(), {})
+                bucket[0].update(counts)
+                events.extend((pos, name, bucket[1]) for name, pos in first.items())
+        events.sort(key=itemgetter(0))
+        for _pos, name, merged_first in events:
+            if name not in merged_first:
+                merged_first[name] = seq
+                seq += 1
+    return index
+
+
+@lru_cache(maxsize=256)
+def _top_evidence(data_dir: str, signature: Tuple, reaction_type: str, kind: str) -> Tuple[Tuple[str, float], ...]:
+    """Top-10 (name, count) of `kind` over index groups matching reaction_type.
+
+    Keyed by the dataset signature, so repeat lookups for a reaction type skip
+    the merge until a dataset file changes.
+    """
+    merged: Counter = Counter()
+    first: Dict[str, int] = {}
+    for rtype, group in _build_evidence_index(data_dir, signature).items():
+        if kind not in group or not _reaction_types_match(rtype, reaction_type):
+            continue
+        counts, seen = group[kind]
+        merged.update(counts)
+        for name, pos in seen.items():
+            if pos < first.get(name, pos + 1):
+                first[name] = pos
+    # Highest count first; ties keep dataset order
+    top = heapq.nsmallest(10, merged, key=lambda name: (-merged[name], first[name]))
+    return tuple((name, float(merged[name])) for name in top)
+
+def _first_field(row: Dict, *names: str) -> str:
+    """First non-empty value among alias columns, or ''."""
+    for name in names:
+        val = row.get(name)
+        if val:
+            return val
+    return ''
+
+
+@lru_cache(maxsize=8)
+def _similarity_rows(path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, str], ...]:
+    """Hit fields of every row in one dataset file, for the general similarity search.
+
+    Cached per (path, mtime_ns, size) like _scan_evidence_file, so repeat queries
+    skip CSV parsing. A file that fails mid-read keeps the rows read so far. The
+    dicts are shared; callers copy before adding per-query keys.
+    """
+    fname = os.path.basename(path)
+    rows: List[Dict[str, str]] = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            # Auto-select delimiter by extension
+            if fname[-4:].lower() == '.tsv':
+                reader = csv.DictReader(f, delimiter='\t')
+            else:
+                reader = csv.DictReader(f)
+            for row in reader:
+                # Flexible field harvesting for richer hit details
+                rows.append({
+                    'ReactionID': row.get('ReactionID') or '',
+                    'ReactionType': row.get('ReactionType') or '',
+                    'CondKey': row.get('CondKey') or '',
+                    'ReactantSMILES': row.get('ReactantSMILES') or '',
+                    'ProductSMILES': row.get('ProductSMILES') or '',
+                    'Ligand': row.get('Ligand') or '',
+                    # Support both legacy and new columns
+                    'Reagent': row.get('Reagent') or row.get('ReagentRaw') or '',
+                    'ReagentRole': row.get('ReagentRole') or '',
+                    'RGTName': row.get('RGTName') or '',
+                    'SOLName': row.get('SOLName') or '',
+                    'Solvent': row.get('Solvent') or '',
+                    'CoreDetail': row.get('CoreDetail') or '',
+                    'CoreGeneric': row.get('CoreGeneric') or '',
+                    'YieldPct': _first_field(row, 'Yield', 'Yield_%', 'Yield(%)', 'Yield%', 'Yield %', 'Yield_pct'),
+                    'Temperature': _first_field(row, 'Temperature', 'Temp', 'Temperature_C', 'TempC', 'Temp_C'),
+                    'Time': _first_field(row, 'Time', 'Hours', 'Time_h', 'Duration'),
+                    'CatalystLike': _first_field(row, 'Catalyst', 'Cat', 'CopperSource', 'PdSource', 'Metal'),
+                    'Reference': _first_field(row, 'Reference', 'DOI', 'URL', 'Source', 'JournalRef'),
+                    'DatasetFile': fname,
+                })
+    except Exception:
+        pass
+    return tuple(rows)
+
+
+def _mixture_fingerprint(smiles: str):
+    """Bitwise OR of Morgan fingerprints (radius 2, 2048 bits) of the '.'-separated
+    components of `smiles`; None when no component parses. Requires RDKit."""
+    from rdkit import Chem
+    from rdkit.Chem import AllChem
+
+    combo = None
+    for part in str(smiles or '').split('.'):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            m = Chem.MolFromSmiles(part)
+        except Exception:
+            continue
+        if not m:
+            continue
+        fp = AllChem.GetMorganFingerprintAsBitVect(m, 2, nBits=2048)
+        if combo is None:
+            combo = fp
+        else:
+            combo |= fp
+    return combo
+
+
+# On-disk fingerprint cache, so one-shot CLI runs also skip re-fingerprinting the datasets.
+# Bump the version whenever _mixture_fingerprint changes.
+_FP_CACHE_DIR = os.path.join(_ROOT, '.cache', 'fingerprints')
+_FP_CACHE_VERSION = 1
+
+
+def _fp_cache_file(path: str) -> str:
+    tag = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(_FP_CACHE_DIR, f"{os.path.basename(path)}-{tag}.pkl")
+
+
+@lru_cache(maxsize=8)
+def _similarity_fingerprints(path: str, mtime_ns: int, size: int) -> Tuple[Tuple[object, object], ...]:
+    """(reactant, product) fingerprints aligned with _similarity_rows(path, ...).
+
+    Either side is None when its SMILES is empty or unparsable. Cached in memory
+    and under .cache/fingerprints, both keyed by (mtime_ns, size).
+    """
+    rows = _similarity_rows(path, mtime_ns, size)
+    cache_file = _fp_cache_file(path)
+    key = (_FP_CACHE_VERSION, mtime_ns, size, len(rows))
+    try:
+        with open(cache_file, 'rb') as f:
+            stored_key, fps = pickle.load(f)
+        if stored_key == key:
+            return fps
+    except Exception:
+        pass  # missing, stale format or unreadable: rebuild below
+
+    fps = tuple(
+        (_mixture_fingerprint(r['ReactantSMILES']),
+         _mixture_fingerprint(r['ProductSMILES']) if r['ProductSMILES'] else None)
+        for r in rows
+    )
+    try:
+        os.makedirs(_FP_CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=_FP_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, fps), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except Exception:
+        pass  # read-only checkout etc.: in-memory cache still applies
+    return fps
+
+
+@lru_cache(maxsize=8)
+def _similarity_fp_columns(path: str, mtime_ns: int, size: int):
+    """Fingerprint columns for bulk Tanimoto: (reactant row indices, reactant fps,
+    product row indices, product fps), rows without a fingerprint left out."""
+    fps = _similarity_fingerprints(path, mtime_ns, size)
+    r_idx = [i for i, (rfp, _) in enumerate(fps) if rfp is not None]
+    p_idx = [i for i, (_, pfp) in enumerate(fps) if pfp is not None]
+    return (np.array(r_idx, dtype=np.intp), [fps[i][0] for i in r_idx],
+            np.array(p_idx, dtype=np.intp), [fps[i][1] for i in p_idx])
+
+
+# Bound on memoized _get_enhanced_recommendations results per engine instance
+_ENHANCED_CACHE_MAX = 256
+
+
+@dataclass(frozen=True, slots=True)
+class AnalyticsCfg:
+    """Analytics priors configuration with the per-kind fallbacks already resolved."""
+    enabled: bool
+    apply_solvents: bool
+    apply_bases: bool
+    apply_ligands: bool
+    w_solvents: float
+    w_bases: float
+    w_ligands: float
+    # None when soft_penalty is off
+    pen_solvents: Optional[float]
+    pen_bases: Optional[float]
+    pen_ligands: Optional[float]
+    min_support_pct: float
+    # kind -> (applies, weight, penalty), derived from the fields above in from_dict
+    by_kind: Mapping[str, Tuple[bool, float, Optional[float]]] = field(compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, cfg: Dict) -> "AnalyticsCfg":
+        """Resolve w_freq_<kind> -> w_freq and penalty_factor_<kind> -> penalty_factor once."""
+        apply_to = cfg.get('apply_to') or {}
+        soft = bool(cfg.get('soft_penalty', True))
+        w = {k: float(cfg.get(f'w_freq_{k}', cfg.get('w_freq', 0.30))) for k in _PRIOR_KINDS}
+        pen = {k: float(cfg.get(f'penalty_factor_{k}', cfg.get('penalty_factor', 0.85))) if soft else None
+               for k in _PRIOR_KINDS}
+        enabled = bool(cfg.get('enabled', True))
+        apply = {k: bool(apply_to.get(k, False)) for k in _PRIOR_KINDS}
+        return cls(
+            enabled=enabled,
+            apply_solvents=apply['solvents'],
+            apply_bases=apply['bases'],
+            apply_ligands=apply['ligands'],
+            w_solvents=w['solvents'],
+            w_bases=w['bases'],
+            w_ligands=w['ligands'],
+            pen_solvents=pen['solvents'],
+            pen_bases=pen['bases'],
+            pen_ligands=pen['ligands'],
+            min_support_pct=float(cfg.get('min_support_pct', 0.01) or 0.01),
+            by_kind=MappingProxyType({k: (enabled and apply[k], w[k], pen[k]) for k in _PRIOR_KINDS}),
+        )
+
+    def applies(self, kind: str) -> bool:
+        return self.by_kind[kind][0]
+
+    def weight(self, kind: str) -> float:
+        return self.by_kind[kind][1]
+
+    def penalty(self, kind: str) -> Optional[float]:
+        return self.by_kind[kind][2]
+
+
+# ===== Static reaction knowledge (read-only; built once at import) =====
+# Known synergistic ligand-solvent combinations: reaction type -> (ligand, solvent) -> bonus
+_SYNERGIES_SRC = {
+    'Cross-Coupling': {
+        ('SPhos', 'DMF'): 0.1,
+        ('XPhos', 'THF'): 0.1,
+        ('RuPhos', 'DMF'): 0.08,
+        ('BINAP', 'Toluene'): 0.05,
+        ('PPh3', 'THF'): 0.05
+    },
+    'Ullmann': {
+        ('1,10-Phenanthroline', 'DMSO'): 0.10,
+        ("2,2'-Bipyridine", 'DMSO'): 0.10,
+        ('L-Proline', 'DMSO'): 0.08,
+        ('Ethylenediamine', 'DMF'): 0.08,
+        ('DMEDA', 'Toluene'): 0.06,
+    },
+    'Hydrogenation': {
+        ('BINAP', 'Ethanol'): 0.15,
+        ('Tol-BINAP', 'Methanol'): 0.15,
+        ('PPh3', 'Ethanol'): 0.08,
+        ('DPPF', 'Ethanol'): 0.08
+    },
+    'Metathesis': {
+        ('IPr', 'Dichloromethane'): 0.12,
+        ('IMes', 'Dichloromethane'): 0.12,
+        ('SIPr', 'Toluene'): 0.1
+    }
+}
+# Keys interned to match the interned names from the reagent loaders
+_SYNERGIES: Mapping[str, Mapping[Tuple[str, str], float]] = MappingProxyType({
+    rt: MappingProxyType({(sys.intern(lig), sys.intern(sol)): bonus for (lig, sol), bonus in pairs.items()})
+    for rt, pairs in _SYNERGIES_SRC.items()})
+_NO_SYNERGIES: Mapping[Tuple[str, str], float] = MappingProxyType({})
+
+# Default conditions by reaction type (read-only: the tables are shared)
+_TYPICAL_CONDITIONS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    'Cross-Coupling': MappingProxyType({
+        'temperature': '80-120°C',
+        'time': '4-24 hours',
+        'atmosphere': 'Inert (N₂ or Ar)',
+        'base': 'K₂CO₃ or Cs₂CO₃',
+        'catalyst_loading': '1-5 mol%'
+    }),
+    'Ullmann': MappingProxyType({
+        'temperature': '80-140°C',
+        'time': '6-24 hours',
+        'atmosphere': 'Inert (N₂ or Ar)',
+        'base': 'K₂CO₃, Cs₂CO₃, K₃PO₄ or KOtBu',
+        'catalyst_loading': '5-20 mol% Cu',
+        'additives': 'Ligands: phen, bipy, L-proline, diamines'
+    }),
+    'Hydrogenation': MappingProxyType({
+        'temperature': '20-80°C',
+        'time': '2-16 hours',
+        'atmosphere': 'H₂ (1-50 atm)',
+        'catalyst_loading': '0.1-2 mol%',
+        'additives': 'May require acid'
+    }),
+    'Metathesis': MappingProxyType({
+        'temperature': '20-60°C',
+        'time': '1-8 hours',
+        'atmosphere': 'Inert (N₂ or Ar)',
+        'catalyst_loading': '1-5 mol%',
+        'additives': 'Avoid moisture'
+    }),
+    'C-H_Activation': MappingProxyType({
+        'temperature': '100-160°C',
+        'time': '6-48 hours',
+        'atmosphere': 'Inert or air',
+        'catalyst_loading': '5-10 mol%',
+        'additives': 'May require oxidant'
+    }),
+    'Carbonylation': MappingProxyType({
+        'temperature': '60-140°C',
+        'time': '4-24 hours',
+        'atmosphere': 'CO (1-20 atm)',
+        'catalyst_loading': '1-5 mol%',
+        'base': 'Organic base (Et₃N)'
+    })
+})
+_DEFAULT_TYPICAL_CONDITIONS: Mapping[str, str] = MappingProxyType({
+    'temperature': '20-100°C',
+    'time': '1-24 hours',
+    'atmosphere': 'Inert',
+    'catalyst_loading': '1-5 mol%'
+})
+
+# Reaction-specific guidance notes
+_REACTION_NOTES: Mapping[str, str] = MappingProxyType({
+    'Cross-Coupling': """
+💡 Cross-Coupling Optimization Tips:
+• Use bulky phosphines (XPhos, SPhos) for challenging substrates
+• Polar aprotic solvents (DMF, NMP) often give best results
+• Consider base choice: K₂CO₃ for most substrates, Cs₂CO₃ for difficult cases
+• Temperature typically 80-120°C depending on substrate reactivity
+• Degassing is critical - use Schlenk techniques or glovebox
+            """,
+    'Ullmann': """
+💡 Ullmann Coupling Optimization Tips:
+• Copper sources: CuI, CuBr, Cu(OAc)₂, Cu₂O; often with simple ligands
+• Ligands: diamines (e.g., ethylenediamine), amino acids (e.g., L-proline), phenanthroline
+• Bases: K₂CO₃, Cs₂CO₃, K₃PO₄, KOtBu; water sometimes beneficial
+• Solvents: DMSO, DMF, toluene, dioxane; 80–140°C typical
+• For C–O/C–N: substrate electronics impact rates; consider stronger base for aryl chlorides
+            """,
+    'Hydrogenation': """
+💡 Hydrogenation Optimization Tips:
+• Bidentate ligands (BINAP, DuPhos) excellent for asymmetric reductions
+• Protic solvents (alcohols) often enhance reactivity
+• Start with low pressure (1-5 atm H₂) and increase if needed
+• Temperature usually mild (20-80°C) to avoid over-reduction
+• Check for catalyst poisoning from sulfur/nitrogen compounds
+            """,
+    'Metathesis': """
+💡 Metathesis Optimization Tips:
+• NHC ligands (IPr, IMes) provide high activity and stability
+• Non-coordinating solvents (DCM, toluene) are preferred
+• Strict exclusion of moisture and oxygen is essential
+• Low catalyst loadings (1-5 mol%) usually sufficient
+• Consider ring-closing vs cross-metathesis selectivity
+            """,
+    'C-H_Activation': """
+💡 C-H Activation Optimization Tips:
+• High temperatures (100-160°C) often required
+• Polar solvents (DMSO, DMF) can facilitate C-H cleavage
+• Consider directing groups for regioselectivity
+• Oxidants may be required for catalytic turnover
+• Screen different bases for optimal reactivity
+            """,
+    'Carbonylation': """
+💡 Carbonylation Optimization Tips:
+• CO pressure critical for good conversion (1-20 atm)
+• Polar solvents (DMF, NMP) enhance CO solubility
+• Phosphine ligands (PPh3, DPPF) commonly effective
+• Base helps remove HX byproducts
+• Monitor for catalyst degradation at high CO pressure
+            """
+})
+
+
+def _typical_conditions_for(reaction_type: str) -> Mapping[str, str]:
+    """Typical conditions for a reaction type as a shared read-only mapping."""
+    return _TYPICAL_CONDITIONS.get(reaction_type, _DEFAULT_TYPICAL_CONDITIONS)
+
 
 class EnhancedRecommendationEngine:
     """Enhanced recommendation engine with integrated ligand and solvent recommendations"""
     
     def __init__(self):
         self.base_engine = None
+        self._enhanced_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
         # QUARC integration options (Phase 0 defaults)
         self._quarc_opts = {
             'use_quarc': os.environ.get('USE_QUARC', 'auto'),  # auto|always|off
@@ -53,7 +1094,7 @@ class EnhancedRecommendationEngine:
             'quarc_topk': 5,
         }
         # Analytics priors configuration (Milestone 2)
-        self._analytics_cfg = {
+        self._analytics_cfg = AnalyticsCfg.from_dict({
             'enabled': True,
             'apply_to': {
                 'solvents': True,
@@ -72,154 +1113,43 @@ class EnhancedRecommendationEngine:
             'penalty_factor_bases': 0.85,
             'penalty_factor_ligands': 0.88,
             'min_support_pct': 0.01,  # ignore items <1% support
-        }
+        })
         if BASE_ENGINE_AVAILABLE:
             try:
                 self.base_engine = BaseRecommendationEngine()
             except:
                 pass
-        # Accept CLI-provided overrides for QUARC options if present (set by predict_cli)
-        try:
-            cli_opts = getattr(self, '_cli_quarc_options', None)
-            if isinstance(cli_opts, dict):
-                self._quarc_opts.update({k: v for k, v in cli_opts.items() if v is not None})
-        except Exception:
-            pass
     
     def analyze_reaction_type(self, reaction_smiles: str, suggested_type: str = None) -> str:
         """Analyze and determine the reaction type from SMILES"""
-        
-        # If user specified a type, try to map it
-        if suggested_type and suggested_type not in ("Auto-detect", "Auto detect reaction type"):
-            mapped_type = self._map_reaction_type(suggested_type)
-            if mapped_type:
-                return mapped_type
-        
-        # Auto-detect based on SMILES pattern analysis
-        if ">>" not in reaction_smiles:
-            return "General Organic Reaction"
-        
-        try:
-            reactants, products = reaction_smiles.split(">>", 1)
-            
-            # Look for common patterns
-            if self._is_cross_coupling_pattern(reactants, products):
-                return "Cross-Coupling"
-            elif self._is_hydrogenation_pattern(reactants, products):
-                return "Hydrogenation"
-            elif self._is_carbonylation_pattern(reactants, products):
-                return "Carbonylation"
-            elif self._is_ch_activation_pattern(reactants, products):
-                return "C-H_Activation"
-            else:
-                return "Cross-Coupling"  # Default to cross-coupling for organometallic reactions
-                
-        except Exception:
-            return "General Organic Reaction"
+        return _analyze_reaction_type(reaction_smiles, suggested_type)
     
     def _map_reaction_type(self, gui_type: str) -> Optional[str]:
         """Map GUI reaction types to our enhanced system types"""
-        # Strip trailing metal tags like " (Pd)" or " (Cu)" from GUI label
-        base_gui = gui_type
-        try:
-            if gui_type and gui_type.endswith(')') and ' (' in gui_type:
-                base_gui = gui_type[:gui_type.rfind(' (')]
-        except Exception:
-            base_gui = gui_type
-
-        mapping = {
-            # Couplings
-            "Suzuki-Miyaura Coupling": "Cross-Coupling",
-            "C-C Coupling - Suzuki-Miyaura": "Cross-Coupling",
-            "Buchwald-Hartwig Amination": "Cross-Coupling",
-            "C-N Coupling - Buchwald-Hartwig": "Cross-Coupling",
-            "Heck Coupling": "Cross-Coupling",
-            "C-C Coupling - Heck": "Cross-Coupling",
-            "Sonogashira Coupling": "Cross-Coupling",
-            "C-C Coupling - Sonogashira": "Cross-Coupling",
-            "Stille Coupling": "Cross-Coupling",
-            "C-C Coupling - Stille": "Cross-Coupling",
-            "Negishi Coupling": "Cross-Coupling",
-            "C-C Coupling - Negishi": "Cross-Coupling",
-            # Chan-Lam oxidative C-N coupling
-            "Chan-Lam Coupling": "Cross-Coupling",
-            "C-N Oxidative Coupling - Chan-Lam": "Cross-Coupling",
-            "C-N Coupling - Chan-Lam": "Cross-Coupling",
-            # Ullmann variants
-            "Ullmann Ether Synthesis": "Ullmann",
-            "Ullmann Reaction": "Ullmann",
-            "C-N Coupling - Ullmann": "Ullmann",
-            "C-O Coupling - Ullmann Ether": "Ullmann",
-            "C-O Coupling - Ullmann": "Ullmann",
-            # Other categories
-            "Hydrogenation": "Hydrogenation",
-            "Carbonylation": "Carbonylation",
-            "Oxidation": "C-H_Activation",
-            "C-H Activation": "C-H_Activation"
-        }
-        return mapping.get(base_gui)
+        return _map_reaction_type(gui_type)
     
     def _is_cross_coupling_pattern(self, reactants: str, products: str) -> bool:
         """Check if reaction pattern matches cross-coupling"""
-        # Look for halogens, boronic acids, etc.
-        halogen_pattern = r'[Br]|[Cl]|[I]'
-        boron_pattern = r'B\(O\)'
-        nitrogen_pattern = r'N[^a-z]'  # Nitrogen not part of aromatic system
-        
-        has_halogen = bool(re.search(halogen_pattern, reactants))
-        has_boron = bool(re.search(boron_pattern, reactants))
-        has_nitrogen = bool(re.search(nitrogen_pattern, reactants))
-        
-        return (has_halogen and has_boron) or (has_halogen and has_nitrogen)
+        return _is_cross_coupling_pattern(reactants, products)
     
     def _is_hydrogenation_pattern(self, reactants: str, products: str) -> bool:
         """Check if reaction pattern matches hydrogenation"""
-        # Look for reduction of double bonds, carbonyls, etc.
-        # Simple heuristic: check for decrease in unsaturation
-        reactant_double_bonds = reactants.count('=') + reactants.count('#') * 2
-        product_double_bonds = products.count('=') + products.count('#') * 2
-        
-        return product_double_bonds < reactant_double_bonds
+        return _is_hydrogenation_pattern(reactants, products)
     
     def _is_carbonylation_pattern(self, reactants: str, products: str) -> bool:
         """Check if reaction pattern matches carbonylation"""
-        # Look for CO insertion patterns
-        reactant_carbonyls = reactants.count('C=O') + reactants.count('C(=O)')
-        product_carbonyls = products.count('C=O') + products.count('C(=O)')
-        
-        return product_carbonyls > reactant_carbonyls
+        return _is_carbonylation_pattern(reactants, products)
     
     def _is_ch_activation_pattern(self, reactants: str, products: str) -> bool:
         """Check if reaction pattern matches C-H activation"""
-        # Look for aromatic substitution patterns
-        aromatic_reactants = reactants.count('c') + reactants.count('C')
-        aromatic_products = products.count('c') + products.count('C')
-        
-        # Simple heuristic: more aromatic complexity in products
-        return aromatic_products > aromatic_reactants * 1.2
+        return _is_ch_activation_pattern(reactants, products)
 
     def _matches_reaction_type(self, row_type: str, target: str) -> bool:
         """Flexible match between dataset row ReactionType and engine target label.
 
         Handles renamed files/labels and common synonyms across families.
         """
-        rt = (row_type or '').strip().lower()
-        tgt = (target or '').strip().lower()
-        if not rt or not tgt:
-            return False
-        if rt == tgt:
-            return True
-        # Cross-Coupling umbrella should include common subfamilies
-        if tgt == 'cross-coupling':
-            sub = ['buchwald', 'buchwald-hartwig', 'suzuki', 'heck', 'sonogashira', 'stille', 'negishi', 'chan-lam']
-            return any(s in rt for s in sub)
-        # Amide formation synonyms
-        if 'amide' in tgt:
-            return any(s in rt for s in ['amide', 'amidation', 'amide coupling', 'carboxyl activation'])
-        # Ullmann: accept minor variations
-        if 'ullmann' in tgt:
-            return 'ullmann' in rt
-        return False
+        return _reaction_types_match(row_type or '', target or '')
     
     def get_recommendations(self, reaction_smiles: str, reaction_type: str = "Auto-detect") -> Dict:
         """Get comprehensive recommendations including ligands and solvents"""
@@ -260,8 +1190,9 @@ class EnhancedRecommendationEngine:
 
             # If user left type as Auto-detect, also compute a general, cross-dataset
             # similarity-based recommendation set as supplemental guidance.
+            rt_lower = (reaction_type or '').lower()
             try:
-                if (reaction_type or '').lower().startswith('auto'):
+                if rt_lower.startswith('auto'):
                     gen = self._get_general_similarity_recommendations(reaction_smiles)
                     if gen:
                         result['general_recommendations'] = gen
@@ -271,14 +1202,16 @@ class EnhancedRecommendationEngine:
             
             # Try to get base engine recommendations as supplementary info
             # Suppress Buchwald analysis for Ullmann selections/detections
-            if self.base_engine and (actual_reaction_type or "").lower() != "ullmann":
+            if (self.base_engine and self.base_engine.recommenders
+                    and (actual_reaction_type or '').lower() != 'ullmann'
+                    and _could_be_buchwald(reaction_smiles, rt_lower)):
                 try:
                     base_recs = self.base_engine.get_recommendations(reaction_smiles, reaction_type)
                     if base_recs and base_recs.get('analysis_type') == 'buchwald_hartwig':
                         result['buchwald_hartwig_analysis'] = base_recs
                         result['analysis_type'] = 'comprehensive'  # Both enhanced + base
                 except Exception as e:
-                    print(f"Base engine error: {e}")
+                    _warn_once(f"Base engine error: {type(e).__name__}: {e}")
             
             # Providers metadata for export/meta
             providers = []
@@ -298,7 +1231,37 @@ class EnhancedRecommendationEngine:
             }
     
     def _get_enhanced_recommendations(self, reaction_smiles: str, reaction_type: str) -> Dict:
-        """Get enhanced ligand and solvent recommendations"""
+        """Get enhanced ligand and solvent recommendations (memoized per instance).
+
+        Keyed by the inputs, the analytics config, the analytics summary mtime and the
+        dataset signature so config tweaks, a regenerated latest.json or edited dataset
+        files are picked up. Callers receive a deep copy and may mutate it freely.
+        """
+        try:
+            dataset_sig = _dataset_signature(_DATASET_DIR)
+        except OSError:
+            dataset_sig = ()
+        key = (
+            reaction_smiles,
+            reaction_type,
+            self._analytics_cfg,
+            self._analytics_stamp(reaction_type),
+            dataset_sig,
+        )
+        cached = self._enhanced_cache.get(key)
+        if cached is None:
+            cached = self._build_enhanced_recommendations(reaction_smiles, reaction_type)
+            if 'error' in cached:
+                return cached
+            self._enhanced_cache[key] = cached
+            if len(self._enhanced_cache) > _ENHANCED_CACHE_MAX:
+                self._enhanced_cache.popitem(last=False)
+        else:
+            self._enhanced_cache.move_to_end(key)
+        return copy.deepcopy(cached)
+
+    def _build_enhanced_recommendations(self, reaction_smiles: str, reaction_type: str) -> Dict:
+        """Compute enhanced ligand and solvent recommendations"""
         
         recommendations = {
             'ligand_recommendations': [],
@@ -310,27 +1273,19 @@ class EnhancedRecommendationEngine:
         }
         
         try:
-            # Normalize scoring mapping for internal parsing, but pass original type to allow Ullmann boosts
-            scoring_type = 'Cross-Coupling' if (reaction_type or '').lower() == 'ullmann' else reaction_type
-
             # Analytics priors (latest.json) take precedence when present; fallback to CSV harvest
             priors = self._load_analytics_summary(reaction_type)
             evidence_ligands = None
             evidence_solvents = None
             evidence_bases = None
+            prior_maps: Dict[str, Dict[str, float]] = {}
             if priors:
-                try:
-                    evidence_solvents = self._extract_priors(priors, 'solvents')
-                except Exception:
-                    evidence_solvents = None
-                try:
-                    evidence_bases = self._extract_priors(priors, 'bases')
-                except Exception:
-                    evidence_bases = None
-                try:
-                    evidence_ligands = self._extract_priors(priors, 'ligands')
-                except Exception:
-                    evidence_ligands = None
+                # Raw priors are None on malformed summaries; the canonical maps are
+                # what the prior appliers below look up
+                evidence_solvents, sol_map = self._analytics_priors(reaction_type, 'solvents')
+                evidence_bases, base_map = self._analytics_priors(reaction_type, 'bases')
+                evidence_ligands, lig_map = self._analytics_priors(reaction_type, 'ligands')
+                prior_maps = {'solvents': sol_map, 'bases': base_map, 'ligands': lig_map}
             else:
                 # Evidence-aware context: mine dataset for ligands/solvents/bases used in similar reactions (if available)
                 evidence_ligands = self._harvest_evidence_ligands(reaction_type)
@@ -338,52 +1293,36 @@ class EnhancedRecommendationEngine:
                 evidence_bases = self._harvest_evidence_bases(reaction_type)
 
             # Get top ligands for this reaction type, with evidence-aware boost
-            ligands = recommend_ligands_for_reaction(
-                reaction_type=reaction_type,
-                top_n=5,
-                min_compatibility=0.4,
-                evidence_ligands=evidence_ligands or None
-            )
+            ligands = copy.deepcopy(_cached_recommend_ligands(
+                reaction_type, 5, 0.4, _evidence_key(evidence_ligands)
+            ))
             # Drop placeholder/dummy items
             if ligands:
                 ligands = [L for L in ligands if str(L.get('ligand') or '').strip().lower() not in ('none', 'n/a', '-')]
             # Apply analytics priors to ligands if configured
-            if priors and self._analytics_cfg['enabled'] and self._analytics_cfg['apply_to']['ligands']:
-                try:
-                    ligands = self._apply_freq_priors_ligands(ligands, priors)
-                except Exception:
-                    pass
+            if priors and self._analytics_cfg.applies('ligands'):
+                ligands = self._apply_freq_priors_ligands(ligands, prior_maps.get('ligands'))
             recommendations['ligand_recommendations'] = ligands
             
             # Get top solvents for this reaction type (pass evidence for gentle boost)
-            solvents = recommend_solvents_for_reaction(
-                reaction_type=reaction_type,
-                top_n=5,
-                min_compatibility=0.4,
-                evidence_solvents=evidence_solvents or None
-            )
+            solvents = copy.deepcopy(_cached_recommend_solvents(
+                reaction_type, 5, 0.4, _evidence_key(evidence_solvents)
+            ))
             # Apply analytics priors to solvents if configured
-            if priors and self._analytics_cfg['enabled'] and self._analytics_cfg['apply_to']['solvents']:
-                try:
-                    solvents = self._apply_freq_priors_solvents(solvents, priors)
-                except Exception:
-                    pass
+            if priors and self._analytics_cfg.applies('solvents'):
+                solvents = self._apply_freq_priors_solvents(solvents, prior_maps.get('solvents'))
             recommendations['solvent_recommendations'] = solvents
             
             # Try to get base recommendations if available
             try:
-                from reagents.base import recommend_bases_for_reaction  # type: ignore
                 bases = recommend_bases_for_reaction(
                     reaction_type=reaction_type,
                     top_n=5,
                     min_compatibility=0.4
-                )
+                ) if recommend_bases_for_reaction is not None else []
                 # Apply analytics priors to bases if configured
-                if priors and self._analytics_cfg['enabled'] and self._analytics_cfg['apply_to']['bases']:
-                    try:
-                        bases = self._apply_freq_priors_bases(bases, priors)
-                    except Exception:
-                        pass
+                if priors and self._analytics_cfg.applies('bases'):
+                    bases = self._apply_freq_priors_bases(bases, prior_maps.get('bases'))
                 else:
                     # Legacy evidence-aware gentle boost to bases
                     try:
@@ -391,19 +1330,11 @@ class EnhancedRecommendationEngine:
                             # Normalize weights
                             max_w = max(float(v) for v in evidence_bases.values()) if evidence_bases else 0.0
                             if max_w > 0:
-                                def _canon_base(nm: str) -> str:
-                                    s = (nm or '').strip()
-                                    if '(' in s and ')' in s:
-                                        inner = s[s.rfind('(')+1:s.rfind(')')].strip()
-                                        if inner:
-                                            s = inner
-                                    return s.lower()
-
-                                ev_map = { _canon_base(k): float(v) for k, v in evidence_bases.items() }
+                                ev_map = { _canon_name(k, 'evidence_bases'): float(v) for k, v in evidence_bases.items() }
                                 boosted = []
                                 for b in bases:
                                     name = b.get('base') or ''
-                                    key = _canon_base(str(name))
+                                    key = _canon_name(str(name), 'evidence_bases')
                                     w = ev_map.get(key, 0.0)
                                     adjusted = b.get('compatibility_score', 0.0)
                                     if w > 0:
@@ -415,7 +1346,8 @@ class EnhancedRecommendationEngine:
                                     boosted.append(nb)
                                 boosted.sort(key=lambda x: x.get('compatibility_score', 0.0), reverse=True)
                                 bases = boosted
-                    except Exception:
+                    except (TypeError, ValueError):
+                        # non-numeric weights/scores: keep unboosted order
                         pass
                 recommendations['base_recommendations'] = bases
             except Exception:
@@ -439,15 +1371,13 @@ class EnhancedRecommendationEngine:
             
             # Add dataset statistics
             try:
-                ligand_df = create_ligand_dataframe()
-                solvent_df = create_solvent_dataframe()
                 recommendations['dataset_info'] = {
-                    'ligands_available': len(ligand_df),
-                    'solvents_available': len(solvent_df),
-                    'reaction_types_supported': ['Cross-Coupling', 'Hydrogenation', 'Metathesis', 'C-H_Activation', 'Carbonylation'],
+                    'ligands_available': _ligand_count(),
+                    'solvents_available': _solvent_count(),
+                    'reaction_types_supported': list(_REACTION_TYPES_SUPPORTED),
                     'analytics_loaded': bool(priors)
                 }
-            except:
+            except Exception:
                 pass
             
         except Exception as e:
@@ -458,18 +1388,17 @@ class EnhancedRecommendationEngine:
     # ===== Phase 1: QUARC adapter hook and merge =====
     def _get_quarc_agents(self, reaction_smiles: str, top_k: int = 5) -> List[Dict]:
         """Call the quarc_oss adapter if configured. Returns list of {name, role?, score?}."""
-        try:
-            mode = (self._quarc_opts.get('use_quarc') or 'auto').lower()
-            if mode == 'off':
-                return []
-            # Require env home/config unless mode is 'always' (still needs config to actually run)
-            from integration.quarc_oss_adapter import get_agents_for_engine  # type: ignore
-        except Exception:
+        mode = (self._quarc_opts.get('use_quarc') or 'auto').lower()
+        if mode == 'off':
+            return []
+        # Require env home/config unless mode is 'always' (still needs config to actually run)
+        get_agents_for_engine = _quarc_agents_fn()
+        if get_agents_for_engine is None:
             return []
 
         cfg = self._quarc_opts.get('quarc_config')
         agents, err = get_agents_for_engine(reaction_smiles, top_k=top_k, config_path=cfg)
-        if err and (self._quarc_opts.get('use_quarc') or 'auto').lower() == 'always':
+        if err and mode == 'always':
             # In 'always' mode, surface a warning; still return [] to fallback
             raise RuntimeError(err.get('message') or 'QUARC error')
         return agents or []
@@ -518,8 +1447,8 @@ class EnhancedRecommendationEngine:
             # Re-apply ligand priors
             try:
                 pri = self._load_analytics_summary(reaction_type)
-                if pri and self._analytics_cfg['enabled'] and self._analytics_cfg['apply_to']['ligands']:
-                    ligs = self._apply_freq_priors_ligands(ligs, pri)
+                if pri and self._analytics_cfg.applies('ligands'):
+                    ligs = self._apply_freq_priors_ligands(ligs, self._analytics_priors(reaction_type, 'ligands')[1], top_n=5)
             except Exception:
                 pass
             recs['ligand_recommendations'] = ligs[:5]
@@ -527,8 +1456,8 @@ class EnhancedRecommendationEngine:
             bases = quarc_bases + bases
             try:
                 pri = self._load_analytics_summary(reaction_type)
-                if pri and self._analytics_cfg['enabled'] and self._analytics_cfg['apply_to']['bases']:
-                    bases = self._apply_freq_priors_bases(bases, pri)
+                if pri and self._analytics_cfg.applies('bases'):
+                    bases = self._apply_freq_priors_bases(bases, self._analytics_priors(reaction_type, 'bases')[1], top_n=5)
             except Exception:
                 pass
             recs['base_recommendations'] = bases[:5]
@@ -553,39 +1482,10 @@ class EnhancedRecommendationEngine:
         try:
             # Lazy import RDKit; if not available, gracefully skip
             try:
-                from rdkit import Chem
-                from rdkit.Chem import AllChem
                 from rdkit import DataStructs
             except Exception:
                 return None
 
-            def _mols_from_mixture(smistr: str) -> List:
-                mols = []
-                if not smistr:
-                    return mols
-                for part in str(smistr).split('.'):
-                    part = part.strip()
-                    if not part:
-                        continue
-                    try:
-                        m = Chem.MolFromSmiles(part)
-                        if m:
-                            mols.append(m)
-                    except Exception:
-                        continue
-                return mols
-
-            def _fp_from_mixture(smistr: str):
-                mols = _mols_from_mixture(smistr)
-                if not mols:
-                    return None
-                fps = [AllChem.GetMorganFingerprintAsBitVect(m, 2, nBits=2048) for m in mols]
-                # Combine by bitwise OR
-                combo = fps[0]
-                for fv in fps[1:]:
-                    combo |= fv
-                return combo
-
             # Build query fingerprints for reactants and products
             react_smi, prod_smi = '', ''
             if '>>' in reaction_smiles:
@@ -593,200 +1493,74 @@ class EnhancedRecommendationEngine:
             else:
                 react_smi = reaction_smiles
                 prod_smi = ''
-            qfp_r = _fp_from_mixture(react_smi)
-            qfp_p = _fp_from_mixture(prod_smi) if prod_smi else None
+            qfp_r = _mixture_fingerprint(react_smi)
+            qfp_p = _mixture_fingerprint(prod_smi) if prod_smi else None
 
             if not qfp_r and not qfp_p:
                 return None
 
-            data_dir = os.path.join(_ROOT, 'data', 'reaction_dataset')
+            data_dir = _DATASET_DIR
             if not os.path.isdir(data_dir):
                 return None
 
             # Collect similarities across all dataset files (CSV/TSV)
             candidates: List[Dict] = []
-            import csv
-            for fname in os.listdir(data_dir):
-                if not (fname.lower().endswith('.csv') or fname.lower().endswith('.tsv')):
+            for entry in _dataset_files(data_dir):
+                try:
+                    st = entry.stat()
+                except OSError:
                     continue
-                path = os.path.join(data_dir, fname)
+                rows = _similarity_rows(entry.path, st.st_mtime_ns, st.st_size)
                 try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        # Auto-select delimiter by extension
-                        if fname.lower().endswith('.tsv'):
-                            reader = csv.DictReader(f, delimiter='\t')
-                        else:
-                            reader = csv.DictReader(f)
-                        for row in reader:
-                            rs = row.get('ReactantSMILES') or ''
-                            ps = row.get('ProductSMILES') or ''
-                            rfp = _fp_from_mixture(rs)
-                            pfp = _fp_from_mixture(ps) if ps else None
-                            sim_r = 0.0
-                            sim_p = 0.0
-                            try:
-                                if qfp_r is not None and rfp is not None:
-                                    sim_r = DataStructs.TanimotoSimilarity(qfp_r, rfp)
-                                if qfp_p is not None and pfp is not None:
-                                    sim_p = DataStructs.TanimotoSimilarity(qfp_p, pfp)
-                            except Exception:
-                                pass
-                            # Weighted combination; favor product when available
-                            if qfp_p is not None and pfp is not None:
-                                sim = 0.6 * sim_p + 0.4 * sim_r
-                            else:
-                                sim = sim_r
-                            if sim <= 0:
-                                continue
-                            # Flexible field harvesting for richer hit details
-                            yield_val = (
-                                row.get('Yield') or row.get('Yield_%') or row.get('Yield(%)') or
-                                row.get('Yield%') or row.get('Yield %') or row.get('Yield_pct') or ''
-                            )
-                            temp_val = (
-                                row.get('Temperature') or row.get('Temp') or row.get('Temperature_C') or
-                                row.get('TempC') or row.get('Temp_C') or ''
-                            )
-                            time_val = (
-                                row.get('Time') or row.get('Hours') or row.get('Time_h') or row.get('Duration') or ''
-                            )
-                            catalyst_val = (
-                                row.get('Catalyst') or row.get('Cat') or row.get('CopperSource') or
-                                row.get('PdSource') or row.get('Metal') or ''
-                            )
-                            reference_val = (
-                                row.get('Reference') or row.get('DOI') or row.get('URL') or
-                                row.get('Source') or row.get('JournalRef') or ''
-                            )
-                            candidates.append({
-                                'ReactionID': row.get('ReactionID') or '',
-                                'ReactionType': row.get('ReactionType') or '',
-                                'CondKey': row.get('CondKey') or '',
-                                'ReactantSMILES': rs,
-                                'ProductSMILES': ps,
-                                'Ligand': row.get('Ligand') or '',
-                                # Support both legacy and new columns
-                                'Reagent': row.get('Reagent') or row.get('ReagentRaw') or '',
-                                'ReagentRole': row.get('ReagentRole') or '',
-                                'RGTName': row.get('RGTName') or '',
-                                'SOLName': row.get('SOLName') or '',
-                                'Solvent': row.get('Solvent') or '',
-                                'CoreDetail': row.get('CoreDetail') or '',
-                                'CoreGeneric': row.get('CoreGeneric') or '',
-                                'YieldPct': yield_val,
-                                'Temperature': temp_val,
-                                'Time': time_val,
-                                'CatalystLike': catalyst_val,
-                                'Reference': reference_val,
-                                'DatasetFile': fname,
-                                'similarity': float(sim)
-                            })
+                    r_idx, r_fps, p_idx, p_fps = _similarity_fp_columns(entry.path, st.st_mtime_ns, st.st_size)
+                    sim_r = np.zeros(len(rows))
+                    sim_p = np.zeros(len(rows))
+                    has_p = np.zeros(len(rows), dtype=bool)
+                    if qfp_r is not None and r_fps:
+                        sim_r[r_idx] = DataStructs.BulkTanimotoSimilarity(qfp_r, r_fps)
+                    if qfp_p is not None and p_fps:
+                        sim_p[p_idx] = DataStructs.BulkTanimotoSimilarity(qfp_p, p_fps)
+                        has_p[p_idx] = True
                 except Exception:
                     continue
+                # Weighted combination; favor product when available
+                sim = np.where(has_p, 0.6 * sim_p + 0.4 * sim_r, sim_r)
+                for i in np.flatnonzero(sim > 0):
+                    candidates.append(dict(rows[i], similarity=float(sim[i])))
 
             if not candidates:
                 return None
 
-            # Keep top K hits
-            candidates.sort(key=lambda x: x['similarity'], reverse=True)
-            top_hits = candidates[:50]
+            # Keep top K hits (nlargest keeps dataset order among ties, like a stable sort)
+            top_hits = heapq.nlargest(50, candidates, key=itemgetter('similarity'))
 
             # Aggregate ligands, solvents, bases weighted by similarity
             lig_counts: Dict[str, float] = defaultdict(float)
             solv_counts: Dict[str, float] = defaultdict(float)
             base_counts: Dict[str, float] = defaultdict(float)
 
-            def _parse_listlike(val: str) -> List[str]:
-                if not val:
-                    return []
-                s = str(val).strip()
-                # Try JSON list first
-                if s.startswith('[') and s.endswith(']'):
-                    try:
-                        arr = json.loads(s)
-                        return [str(x).strip() for x in arr if str(x).strip()]
-                    except Exception:
-                        pass
-                # Fallback: strip quotes/brackets and split by comma
-                s2 = s.strip('[]').replace('"', '').replace("'", '')
-                parts = [p.strip() for p in s2.split(',') if p.strip()]
-                return parts
-
-            # New datasets may encode tokens as "name|CAS"; prefer name, fallback to CAS if name missing
-            def _name_only(tok: str) -> str:
-                try:
-                    if tok is None:
-                        return ''
-                    txt = str(tok)
-                    if '|' in txt:
-                        left, right = txt.split('|', 1)
-                        left = left.strip()
-                        right = right.strip()
-                        return left or right or ''
-                    return txt.strip()
-                except Exception:
-                    return str(tok).strip() if tok is not None else ''
-
-            # Base alias normalization
-            base_alias = {
-                'potassium carbonate (k2co3)': 'K2CO3',
-                'cesium carbonate (cs2co3)': 'Cs2CO3',
-                'tripotassium phosphate (k3po4)': 'K3PO4',
-                'potassium tert-butoxide (kotbu)': 'KOtBu',
-                'sodium tert-butoxide (naotbu)': 'NaOtBu',
-                'sodium carbonate (na2co3)': 'Na2CO3',
-                'potassium hydroxide (koh)': 'KOH',
-                'triethylamine': 'Et3N',
-            }
-
-            def _canon_base(nm: str) -> str:
-                s = (nm or '').strip()
-                low = s.lower()
-                # Pull formula inside parentheses when present
-                if '(' in s and ')' in s:
-                    inner = s[s.rfind('(')+1:s.rfind(')')].strip()
-                    if inner:
-                        low = inner.lower()
-                low = low.replace(' ', '')
-                return base_alias.get(low, s)
-
             # Solvent abbreviation lookup via solvent dataframe if available
-            solv_abbrev: Dict[str, str] = {}
-            try:
-                sdf = create_solvent_dataframe()
-                for _, rowx in sdf.iterrows():
-                    nm = str(rowx.get('name') or '').strip()
-                    ab = str(rowx.get('abbreviation') or '').strip()
-                    if nm:
-                        solv_abbrev[nm] = ab
-                    if ab and ab not in solv_abbrev:
-                        solv_abbrev[ab] = ab
-            except Exception:
-                pass
+            solv_abbrev = _solvent_abbreviations()
 
             for hit in top_hits:
                 w = float(hit.get('similarity') or 0.0)
                 if w <= 0:
                     continue
                 # Ligands
-                for src in ('Ligand',):
-                    for item in _parse_listlike(hit.get(src) or ''):
-                        name = _name_only(item)
-                        if name and name.lower() != 'none':
-                            lig_counts[name] += w
+                for name in _hit_cell_names(hit.get('Ligand') or ''):
+                    if name and name.lower() != 'none':
+                        lig_counts[name] += w
                 # Solvents (handle both columns)
-                sol_items = _parse_listlike(hit.get('Solvent') or '')
-                sol_items += _parse_listlike(hit.get('SOLName') or '')
-                for sitem in sol_items:
-                    name = _name_only(sitem)
+                sol_names = _hit_cell_names(hit.get('Solvent') or '') + _hit_cell_names(hit.get('SOLName') or '')
+                for name in sol_names:
                     if name and name.lower() != 'none':
                         solv_counts[name] += w
                 # Bases (from reagent columns)
                 # New unified reagent columns
-                rraw = _parse_listlike(hit.get('Reagent') or '')
-                rgtn = _parse_listlike(hit.get('RGTName') or '')
-                for bitem in rraw + rgtn:
-                    cb = _canon_base(_name_only(bitem))
+                rraw = _hit_cell_names(hit.get('Reagent') or '')
+                rgtn = _hit_cell_names(hit.get('RGTName') or '')
+                for bname in rraw + rgtn:
+                    cb = _canon_base(bname)
                     if cb and cb.lower() not in ('none', 'unk'):
                         base_counts[cb] += w
 
@@ -802,10 +1576,8 @@ class EnhancedRecommendationEngine:
             base_rank = _rank_map(base_counts)
 
             # Adapt to engine's output shapes
-            # Utility: detect CAS-only tokens (e.g., 108-88-3)
-            cas_re = re.compile(r"^\d{2,7}-\d{2}-\d$")
             def _filter_cas(rank_list: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
-                non_cas = [(n, s) for n, s in rank_list if not cas_re.match(str(n or '').strip())]
+                non_cas = [(n, s) for n, s in rank_list if not _CAS_ONLY_RE.match(str(n or '').strip())]
                 return non_cas if non_cas else rank_list
 
             lig_rank = _filter_cas(lig_rank)
@@ -829,8 +1601,6 @@ class EnhancedRecommendationEngine:
             } for name, score in base_rank[:5]]
 
             # Provide a richer view of top hits (top 15)
-            base_tokens = ['k2co3', 'cs2co3', 'k3po4', 'kotbu', 'naotbu', 'na2co3', 'koh', 'tbuok', 'ko-tbu', 'triethylamine', 'et3n']
-            cas_only_re = re.compile(r'^\d{2,7}-\d{2}-\d$')
             def _dedup(seq: List[str]) -> List[str]:
                 seen = set()
                 out: List[str] = []
@@ -844,29 +1614,26 @@ class EnhancedRecommendationEngine:
 
             def _extract_ligands_from_hit(h: Dict) -> List[str]:
                 ligs = []
-                for item in _parse_listlike(h.get('Ligand') or ''):
-                    nm = _name_only(item)
-                    if nm and nm.lower() not in ('none',) and not cas_only_re.match(nm):
+                for nm in _hit_cell_names(h.get('Ligand') or ''):
+                    if nm and nm.lower() not in ('none',) and not _CAS_ONLY_RE.match(nm):
                         ligs.append(nm)
                 return _dedup(ligs)
 
             def _extract_solvents_from_hit(h: Dict) -> List[str]:
-                sol_items = _parse_listlike(h.get('Solvent') or '') + _parse_listlike(h.get('SOLName') or '')
+                sol_names = _hit_cell_names(h.get('Solvent') or '') + _hit_cell_names(h.get('SOLName') or '')
                 sols = []
-                for sitem in sol_items:
-                    nm = _name_only(sitem)
-                    if nm and nm.lower() not in ('none',) and not cas_only_re.match(nm):
+                for nm in sol_names:
+                    if nm and nm.lower() not in ('none',) and not _CAS_ONLY_RE.match(nm):
                         sols.append(nm)
                 return _dedup(sols)
 
             def _extract_bases_from_hit(h: Dict) -> List[str]:
                 bases = []
-                for bitem in _parse_listlike(h.get('Reagent') or '') + _parse_listlike(h.get('RGTName') or ''):
-                    nm = _name_only(bitem)
+                for nm in _hit_cell_names(h.get('Reagent') or '') + _hit_cell_names(h.get('RGTName') or ''):
                     low = nm.lower().replace(' ', '')
-                    if cas_only_re.match(nm):
+                    if _CAS_ONLY_RE.match(nm):
                         continue
-                    if any(tok in low for tok in base_tokens):
+                    if _has_base_token(low):
                         bases.append(_canon_base(nm))
                 return _dedup(bases)
 
@@ -926,574 +1693,201 @@ class EnhancedRecommendationEngine:
             return {'error': f'general_similarity_error: {e}'}
 
     # ===== Milestone 2: analytics loading and priors application =====
+    def _analytics_summary_path(self, reaction_type: str) -> Optional[str]:
+        """Path of the analytics latest.json for reaction_type (Ullmann only for now)."""
+        if (reaction_type or '').strip().lower() != 'ullmann':
+            return None
+        return os.path.join(_ROOT, 'data', 'analytics', 'Ullmann', 'latest.json')
+
+    def _analytics_stamp(self, reaction_type: str) -> Optional[int]:
+        """mtime_ns of the analytics summary used for reaction_type, or None."""
+        path = self._analytics_summary_path(reaction_type)
+        if not path:
+            return None
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
     def _load_analytics_summary(self, reaction_type: str) -> Optional[dict]:
         """Load data/analytics/<reaction_type>/latest.json if present.
 
         For Milestone 2, we support Ullmann only.
         """
+        mtime_ns = self._analytics_stamp(reaction_type)
+        if mtime_ns is None:
+            return None
         try:
-            rt = (reaction_type or '').strip()
-            if rt.lower() != 'ullmann':
-                return None
-            base = os.path.join(_ROOT, 'data', 'analytics', 'Ullmann')
-            latest = os.path.join(base, 'latest.json')
-            if os.path.exists(latest):
-                with open(latest, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data
-        except Exception:
+            return _read_analytics_json(self._analytics_summary_path(reaction_type), mtime_ns)
+        except (OSError, ValueError):
+            # vanished between stat and open, or not valid JSON
             return None
-        return None
 
     def _extract_priors(self, summary: dict, kind: str) -> Optional[dict]:
         """Extract a mapping name -> pct for a top list kind (e.g., 'solvents', 'bases').
         Returns dict of canonical_name -> pct (0..1).
         """
-        try:
-            top = ((summary or {}).get('top') or {}).get(kind) or []
-            if not top:
-                return None
-            pri = {}
-            for item in top:
-                nm = str(item.get('name') or '').strip()
-                pct = float(item.get('pct') or 0.0)
-                if not nm or pct <= 0:
-                    continue
-                pri[nm] = pct
-            return pri or None
-        except Exception:
-            return None
+        return _extract_priors(summary, kind)
 
-    def _apply_freq_priors_solvents(self, solvents: List[Dict], summary: dict) -> List[Dict]:
-        """Apply frequency-based priors to solvent compatibility scores.
+    def _canon_prior_map(self, pri: Optional[dict], kind: str) -> Dict[str, float]:
+        """Key an _extract_priors() mapping by the canonical form used for `kind`."""
+        return _canon_prior_map(pri, kind)
 
-        final = base * (1 + w * sqrt(pct)) with cap to 1.0
-        """
-        try:
-            import math
-            pri = self._extract_priors(summary, 'solvents') or {}
-            if not pri:
-                return solvents
-            # Optional normalization helpers
-            def _canon(name: str) -> str:
-                s = (name or '').strip()
-                # try to harmonize common cases
-                s_low = s.lower().replace(' ', '')
-                # special-case DMSO often appears as 'dms o' canonical in analytics
-                if s_low in ('dmso', 'dms o', 'dimethylsulfoxide'):
-                    return 'dms o'
-                return s_low
-
-            # Build lookup
-            pri_map = { _canon(k): float(v) for k, v in pri.items() }
-            w = float(self._analytics_cfg.get('w_freq_solvents', self._analytics_cfg.get('w_freq', 0.30)))
-            min_pct = float(self._analytics_cfg.get('min_support_pct', 0.01) or 0.01)
-            boosted: List[Dict] = []
-            for s in solvents:
-                base_score = float(s.get('compatibility_score', 0.0) or 0.0)
-                key = _canon(str(s.get('solvent') or ''))
-                pct = pri_map.get(key, 0.0)
-                adj = base_score
-                if base_score > 0:
-                    if pct >= min_pct:
-                        adj = min(1.0, base_score * (1.0 + w * math.sqrt(pct)))
-                    elif self._analytics_cfg.get('soft_penalty', True):
-                        pen = float(self._analytics_cfg.get('penalty_factor_solvents', self._analytics_cfg.get('penalty_factor', 0.85)))
-                        adj = max(0.0, base_score * pen)
-                ns = dict(s)
-                ns['compatibility_score'] = round(adj, 3)
-                boosted.append(ns)
-            boosted.sort(key=lambda x: x.get('compatibility_score', 0.0), reverse=True)
-            return boosted
-        except Exception:
-            return solvents
+    def _analytics_priors(self, reaction_type: str, kind: str) -> Tuple[Optional[dict], Dict[str, float]]:
+        """(name -> pct priors or None, canonical prior map) for `kind` from the analytics summary.
 
-    def _apply_freq_priors_bases(self, bases: List[Dict], summary: dict) -> List[Dict]:
-        """Apply frequency-based priors to base compatibility scores using analytics.
+        Memoized per summary mtime; callers get their own copies.
         """
+        mtime_ns = self._analytics_stamp(reaction_type)
+        if mtime_ns is None:
+            return None, {}
         try:
-            import math
-            pri = self._extract_priors(summary, 'bases') or {}
-            if not pri:
-                return bases
-
-            def _canon_base(nm: str) -> str:
-                s = (nm or '').strip()
-                # favor formula inside parentheses if present
-                if '(' in s and ')' in s:
-                    inner = s[s.rfind('(')+1:s.rfind(')')].strip()
-                    if inner:
-                        s = inner
-                return s.lower().replace(' ', '')
-
-            pri_map = { _canon_base(k): float(v) for k, v in pri.items() }
-            w = float(self._analytics_cfg.get('w_freq_bases', self._analytics_cfg.get('w_freq', 0.30)))
-            min_pct = float(self._analytics_cfg.get('min_support_pct', 0.01) or 0.01)
-            out: List[Dict] = []
-            for b in bases:
-                base_score = float(b.get('compatibility_score', 0.0) or 0.0)
-                key = _canon_base(str(b.get('base') or ''))
-                pct = pri_map.get(key, 0.0)
-                adj = base_score
-                if base_score > 0:
-                    if pct >= min_pct:
-                        adj = min(1.0, base_score * (1.0 + w * math.sqrt(pct)))
-                    elif self._analytics_cfg.get('soft_penalty', True):
-                        pen = float(self._analytics_cfg.get('penalty_factor_bases', self._analytics_cfg.get('penalty_factor', 0.85)))
-                        adj = max(0.0, base_score * pen)
-                nb = dict(b)
-                nb['compatibility_score'] = round(adj, 3)
-                out.append(nb)
-            out.sort(key=lambda x: x.get('compatibility_score', 0.0), reverse=True)
-            return out
-        except Exception:
-            return bases
-
-    def _apply_freq_priors_ligands(self, ligands: List[Dict], summary: dict) -> List[Dict]:
-        """Apply frequency-based priors to ligand compatibility scores using analytics.
-
-        Similar to solvents/bases. Uses ligand name key directly.
+            pri, canon = _summary_priors(self._analytics_summary_path(reaction_type), mtime_ns, kind)
+        except (OSError, ValueError):
+            return None, {}
+        return (dict(pri) if pri else None), dict(canon)
+
+    def _apply_freq_priors(self, items: List[Dict], pri_map: Dict[str, float], kind: str,
+                           top_n: Optional[int] = None) -> List[Dict]:
+        """Apply frequency-based priors for `kind` ('solvents', 'bases', 'ligands').
+
+        pri_map comes from _canon_prior_map. final = base * (1 + w * sqrt(pct)) with
+        cap to 1.0 when pct >= min_support_pct, otherwise base * penalty_factor when
+        soft_penalty is on. Scores are updated in place on the (freshly built) item
+        dicts and the list is re-sorted by score and returned; with top_n only the
+        best top_n are selected (heap, ties in input order) instead of sorting all.
         """
         try:
-            import math
-            pri = self._extract_priors(summary, 'ligands') or {}
-            if not pri:
-                return ligands
-
-            def _canon(nm: str) -> str:
-                return (nm or '').strip().casefold()
-
-            pri_map = { _canon(k): float(v) for k, v in pri.items() }
-            w = float(self._analytics_cfg.get('w_freq_ligands', self._analytics_cfg.get('w_freq', 0.30)))
-            min_pct = float(self._analytics_cfg.get('min_support_pct', 0.01) or 0.01)
-            out: List[Dict] = []
-            for L in ligands:
-                base_score = float(L.get('compatibility_score', 0.0) or 0.0)
-                key = _canon(str(L.get('ligand') or ''))
-                pct = pri_map.get(key, 0.0)
+            if not pri_map:
+                return items
+            field = _PRIOR_KINDS[kind]
+            cfg = self._analytics_cfg
+            _applies, w, pen = cfg.by_kind[kind]
+            min_pct = cfg.min_support_pct
+            for it in items:
+                base_score = float(it.get('compatibility_score', 0.0) or 0.0)
+                pct = pri_map.get(_canon_name(str(it.get(field) or ''), kind), 0.0)
                 adj = base_score
                 if base_score > 0:
                     if pct >= min_pct:
                         adj = min(1.0, base_score * (1.0 + w * math.sqrt(pct)))
-                    elif self._analytics_cfg.get('soft_penalty', True):
-                        pen = float(self._analytics_cfg.get('penalty_factor_ligands', self._analytics_cfg.get('penalty_factor', 0.85)))
+                    elif pen is not None:
                         adj = max(0.0, base_score * pen)
-                nL = dict(L)
-                nL['compatibility_score'] = round(adj, 3)
-                out.append(nL)
-            out.sort(key=lambda x: x.get('compatibility_score', 0.0), reverse=True)
-            return out
-        except Exception:
-            return ligands
+                it['compatibility_score'] = round(adj, 3)
+            score = lambda x: x.get('compatibility_score', 0.0)
+            if top_n is not None and top_n < len(items):
+                return heapq.nlargest(top_n, items, key=score)
+            items.sort(key=score, reverse=True)
+            return items
+        except (AttributeError, TypeError, ValueError):
+            return items
+
+    def _apply_freq_priors_solvents(self, solvents: List[Dict], pri_map: Dict[str, float],
+                                  top_n: Optional[int] = None) -> List[Dict]:
+        """Apply frequency-based priors to solvent compatibility scores."""
+        return self._apply_freq_priors(solvents, pri_map, 'solvents', top_n)
+
+    def _apply_freq_priors_bases(self, bases: List[Dict], pri_map: Dict[str, float],
+                                  top_n: Optional[int] = None) -> List[Dict]:
+        """Apply frequency-based priors to base compatibility scores using analytics."""
+        return self._apply_freq_priors(bases, pri_map, 'bases', top_n)
+
+    def _apply_freq_priors_ligands(self, ligands: List[Dict], pri_map: Dict[str, float],
+                                  top_n: Optional[int] = None) -> List[Dict]:
+        """Apply frequency-based priors to ligand compatibility scores using analytics."""
+        return self._apply_freq_priors(ligands, pri_map, 'ligands', top_n)
+
+    def _harvest_evidence(self, reaction_type: str, kind: str) -> dict:
+        """Top-10 frequency map of `kind` items across dataset rows matching reaction_type."""
+        if not os.path.isdir(_DATASET_DIR):
+            return {}
+        try:
+            signature = _dataset_signature(_DATASET_DIR)
+        except OSError:
+            # dataset directory unreadable
+            return {}
+        return dict(_top_evidence(_DATASET_DIR, signature, reaction_type or '', kind))
 
     def _harvest_evidence_ligands(self, reaction_type: str) -> dict:
         """Collect a small frequency map of ligands from built-in datasets for this reaction type.
 
-        Keeps it lightweight and offline: scans CSVs in data/reaction_dataset for matching ReactionType.
+        Keeps it lightweight and offline: counts come from a cached scan of the
+        CSV/TSV files in data/reaction_dataset, keyed by ReactionType.
         """
-        evidence: dict[str, float] = {}
-        try:
-            data_dir = os.path.join(_ROOT, 'data', 'reaction_dataset')
-            if not os.path.isdir(data_dir):
-                return evidence
-            # Consider a few known files; ignore huge processing
-            # Helper for name|CAS collapsing
-            def _name_only(tok: str) -> str:
-                try:
-                    if tok is None:
-                        return ''
-                    txt = str(tok)
-                    if '|' in txt:
-                        left, right = txt.split('|', 1)
-                        left = left.strip()
-                        right = right.strip()
-                        return left or right or ''
-                    return txt.strip()
-                except Exception:
-                    return str(tok).strip() if tok is not None else ''
-
-            for fname in os.listdir(data_dir):
-                if not (fname.lower().endswith('.csv') or fname.lower().endswith('.tsv')):
-                    continue
-                path = os.path.join(data_dir, fname)
-                try:
-                    import csv
-                    with open(path, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f, delimiter='\t') if fname.lower().endswith('.tsv') else csv.DictReader(f)
-                        for row in reader:
-                            rtype = (row.get('ReactionType') or '').strip()
-                            if not rtype:
-                                continue
-                            # Flexible match to accommodate renamed datasets
-                            if not self._matches_reaction_type(rtype, reaction_type):
-                                continue
-                            lig_raw = row.get('Ligand') or ''
-                            if not lig_raw:
-                                continue
-                            # Ligand field often like ["L-Proline"] or a list string
-                            # Strip brackets/quotes and split by comma when safe
-                            items = []
-                            s = str(lig_raw).strip()
-                            # crude parse: remove [] and quotes
-                            s = s.strip('[]')
-                            s = s.replace('"', '').replace("'", '')
-                            # split by comma only if present
-                            parts = [p.strip() for p in s.split(',') if p.strip()]
-                            items = parts if parts else ([s] if s else [])
-                            for it in items:
-                                if not it:
-                                    continue
-                                name = _name_only(it)
-                                evidence[name] = evidence.get(name, 0) + 1
-                except Exception:
-                    # ignore a bad file
-                    continue
-            # retain top few
-            if evidence:
-                top = sorted(evidence.items(), key=lambda kv: kv[1], reverse=True)[:10]
-                return {k: float(v) for k, v in top}
-        except Exception:
-            pass
-        return evidence
+        return self._harvest_evidence(reaction_type, 'ligand')
 
     def _harvest_evidence_solvents(self, reaction_type: str) -> dict:
         """Collect frequency map of solvents from built-in datasets for this reaction type."""
-        evidence: dict[str, float] = {}
-        try:
-            data_dir = os.path.join(_ROOT, 'data', 'reaction_dataset')
-            if not os.path.isdir(data_dir):
-                return evidence
-            def _name_only(tok: str) -> str:
-                try:
-                    if tok is None:
-                        return ''
-                    txt = str(tok)
-                    if '|' in txt:
-                        left, right = txt.split('|', 1)
-                        left = left.strip()
-                        right = right.strip()
-                        return left or right or ''
-                    return txt.strip()
-                except Exception:
-                    return str(tok).strip() if tok is not None else ''
-            for fname in os.listdir(data_dir):
-                if not (fname.lower().endswith('.csv') or fname.lower().endswith('.tsv')):
-                    continue
-                path = os.path.join(data_dir, fname)
-                try:
-                    import csv
-                    with open(path, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f, delimiter='\t') if fname.lower().endswith('.tsv') else csv.DictReader(f)
-                        for row in reader:
-                            rtype = (row.get('ReactionType') or '').strip()
-                            if not rtype or not self._matches_reaction_type(rtype, reaction_type):
-                                continue
-                            raw = row.get('Solvent') or row.get('SOLName') or ''
-                            if not raw:
-                                continue
-                            s = str(raw).strip().strip('[]').replace('"', '').replace("'", '')
-                            parts = [p.strip() for p in s.split(',') if p.strip()]
-                            items = parts if parts else ([s] if s else [])
-                            for it in items:
-                                if not it:
-                                    continue
-                                name = _name_only(it)
-                                evidence[name] = evidence.get(name, 0) + 1
-                except Exception:
-                    continue
-            if evidence:
-                top = sorted(evidence.items(), key=lambda kv: kv[1], reverse=True)[:10]
-                return {k: float(v) for k, v in top}
-        except Exception:
-            pass
-        return evidence
+        return self._harvest_evidence(reaction_type, 'solvent')
 
     def _harvest_evidence_bases(self, reaction_type: str) -> dict:
         """Collect frequency map of bases from built-in datasets for this reaction type.
 
         The datasets may store bases under different columns: ReagentRaw/ReagentRole or RGTName, etc.
-        We'll look for common base tokens and increment counts by base name.
+        Items containing a common base token are counted by base name.
         """
-        evidence: dict[str, float] = {}
-        try:
-            data_dir = os.path.join(_ROOT, 'data', 'reaction_dataset')
-            if not os.path.isdir(data_dir):
-                return evidence
-            base_tokens = ['k2co3', 'cs2co3', 'k3po4', 'kotbu', 'naotbu', 'na2co3', 'koh', 'tbuok', 'ko-tbu', 'triethylamine', 'et3n']
-            # Helper for name|CAS collapsing
-            def _name_only(tok: str) -> str:
-                try:
-                    if tok is None:
-                        return ''
-                    txt = str(tok)
-                    if '|' in txt:
-                        left, right = txt.split('|', 1)
-                        left = left.strip()
-                        right = right.strip()
-                        return left or right or ''
-                    return txt.strip()
-                except Exception:
-                    return str(tok).strip() if tok is not None else ''
-            def _maybe_add(text: str):
-                if not text:
-                    return
-                s = str(text).strip().strip('[]').replace('"', '').replace("'", '')
-                parts = [p.strip() for p in s.split(',') if p.strip()]
-                items = parts if parts else ([s] if s else [])
-                for it in items:
-                    low = it.lower()
-                    for tok in base_tokens:
-                        if tok in low:
-                            name = _name_only(it)
-                            evidence[name] = evidence.get(name, 0) + 1
-                            break
-
-            for fname in os.listdir(data_dir):
-                if not (fname.lower().endswith('.csv') or fname.lower().endswith('.tsv')):
-                    continue
-                path = os.path.join(data_dir, fname)
-                try:
-                    import csv
-                    with open(path, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f, delimiter='\t') if fname.lower().endswith('.tsv') else csv.DictReader(f)
-                        for row in reader:
-                            rtype = (row.get('ReactionType') or '').strip()
-                            if not rtype or not self._matches_reaction_type(rtype, reaction_type):
-                                continue
-                            # check common columns
-                            # New column name Reagent (with roles in ReagentRole)
-                            _maybe_add(row.get('Reagent') or row.get('ReagentRaw') or '')
-                            _maybe_add(row.get('RGTName') or '')
-                            _maybe_add(row.get('Base') or '')
-                except Exception:
-                    continue
-            if evidence:
-                top = sorted(evidence.items(), key=lambda kv: kv[1], reverse=True)[:10]
-                return {k: float(v) for k, v in top}
-        except Exception:
-            pass
-        return evidence
+        return self._harvest_evidence(reaction_type, 'base')
     
     def _create_combined_conditions(self, ligands: List[Dict], solvents: List[Dict], reaction_type: str) -> List[Dict]:
         """Create optimized ligand-solvent combinations"""
         
-        combined = []
+        if not ligands or not solvents:
+            return []
         
         # Take top 3 ligands and top 3 solvents
         top_ligands = ligands[:3]
         top_solvents = solvents[:3]
+        # Known good combinations for this reaction type (see _calculate_synergy_bonus)
+        synergies = _SYNERGIES.get(reaction_type, _NO_SYNERGIES)
         
-        for i, ligand in enumerate(top_ligands):
-            for j, solvent in enumerate(top_solvents):
+        # Score every pair first; only the top 5 are turned into result dicts
+        scored = []
+        for ligand in top_ligands:
+            lig_name, lig_score = ligand['ligand'], ligand['compatibility_score']
+            for solvent in top_solvents:
                 # Calculate combined score
-                combined_score = (ligand['compatibility_score'] + solvent['compatibility_score']) / 2
+                combined_score = (lig_score + solvent['compatibility_score']) / 2
                 
                 # Add synergy bonus for known good combinations
-                synergy_bonus = self._calculate_synergy_bonus(
-                    ligand['ligand'], solvent['solvent'], reaction_type
-                )
+                synergy_bonus = synergies.get((lig_name, solvent['solvent']), 0.0)
                 
                 final_score = combined_score + synergy_bonus
-                
-                combined.append({
-                    'rank': len(combined) + 1,
-                    'ligand': ligand['ligand'],
-                    'ligand_compatibility': ligand['compatibility_score'],
-                    'solvent': solvent['solvent'],
-                    'solvent_abbreviation': solvent['abbreviation'],
-                    'solvent_compatibility': solvent['compatibility_score'],
-                    'combined_score': round(final_score, 3),
-                    'synergy_bonus': round(synergy_bonus, 3),
-                    'recommendation_confidence': 'High' if final_score > 0.8 else 'Medium' if final_score > 0.6 else 'Low',
-                    'typical_conditions': self._get_typical_conditions(ligand['ligand'], solvent['solvent'], reaction_type)
-                })
+                # (rounded score, rank = position in pairing order, ...)
+                scored.append((round(final_score, 3), len(scored) + 1, final_score, synergy_bonus, ligand, solvent))
         
-        # Sort by combined score and return top 5
-        combined.sort(key=lambda x: x['combined_score'], reverse=True)
-        return combined[:5]
+        # Top 5 by combined score (ties keep pairing order, as a stable sort would)
+        return [{
+            'rank': rank,
+            'ligand': ligand['ligand'],
+            'ligand_compatibility': ligand['compatibility_score'],
+            'solvent': solvent['solvent'],
+            'solvent_abbreviation': solvent['abbreviation'],
+            'solvent_compatibility': solvent['compatibility_score'],
+            'combined_score': score,
+            'synergy_bonus': synergy_bonus,  # table values already have <= 3 decimals
+            'recommendation_confidence': 'High' if final_score > 0.8 else 'Medium' if final_score > 0.6 else 'Low',
+            'typical_conditions': self._get_typical_conditions(ligand['ligand'], solvent['solvent'], reaction_type)
+        } for score, rank, final_score, synergy_bonus, ligand, solvent in heapq.nlargest(5, scored, key=itemgetter(0))]
     
     def _calculate_synergy_bonus(self, ligand: str, solvent: str, reaction_type: str) -> float:
         """Calculate synergy bonus for specific ligand-solvent combinations"""
-        
-        # Known synergistic combinations
-        synergies = {
-            'Cross-Coupling': {
-                ('SPhos', 'DMF'): 0.1,
-                ('XPhos', 'THF'): 0.1,
-                ('RuPhos', 'DMF'): 0.08,
-                ('BINAP', 'Toluene'): 0.05,
-                ('PPh3', 'THF'): 0.05
-            },
-            'Ullmann': {
-                ('1,10-Phenanthroline', 'DMSO'): 0.10,
-                ("2,2'-Bipyridine", 'DMSO'): 0.10,
-                ('L-Proline', 'DMSO'): 0.08,
-                ('Ethylenediamine', 'DMF'): 0.08,
-                ('DMEDA', 'Toluene'): 0.06,
-            },
-            'Hydrogenation': {
-                ('BINAP', 'Ethanol'): 0.15,
-                ('Tol-BINAP', 'Methanol'): 0.15,
-                ('PPh3', 'Ethanol'): 0.08,
-                ('DPPF', 'Ethanol'): 0.08
-            },
-            'Metathesis': {
-                ('IPr', 'Dichloromethane'): 0.12,
-                ('IMes', 'Dichloromethane'): 0.12,
-                ('SIPr', 'Toluene'): 0.1
-            }
-        }
-        
-        reaction_synergies = synergies.get(reaction_type, {})
-        return reaction_synergies.get((ligand, solvent), 0.0)
+        return _SYNERGIES.get(reaction_type, _NO_SYNERGIES).get((ligand, solvent), 0.0)
     
     def _get_typical_conditions(self, ligand: str, solvent: str, reaction_type: str) -> Dict:
         """Get typical reaction conditions for ligand-solvent combination"""
-        
-        # Default conditions by reaction type
-        conditions = {
-            'Cross-Coupling': {
-                'temperature': '80-120°C',
-                'time': '4-24 hours',
-                'atmosphere': 'Inert (N₂ or Ar)',
-                'base': 'K₂CO₃ or Cs₂CO₃',
-                'catalyst_loading': '1-5 mol%'
-            },
-            'Ullmann': {
-                'temperature': '80-140°C',
-                'time': '6-24 hours',
-                'atmosphere': 'Inert (N₂ or Ar)',
-                'base': 'K₂CO₃, Cs₂CO₃, K₃PO₄ or KOtBu',
-                'catalyst_loading': '5-20 mol% Cu',
-                'additives': 'Ligands: phen, bipy, L-proline, diamines'
-            },
-            'Hydrogenation': {
-                'temperature': '20-80°C',
-                'time': '2-16 hours',
-                'atmosphere': 'H₂ (1-50 atm)',
-                'catalyst_loading': '0.1-2 mol%',
-                'additives': 'May require acid'
-            },
-            'Metathesis': {
-                'temperature': '20-60°C',
-                'time': '1-8 hours',
-                'atmosphere': 'Inert (N₂ or Ar)',
-                'catalyst_loading': '1-5 mol%',
-                'additives': 'Avoid moisture'
-            },
-            'C-H_Activation': {
-                'temperature': '100-160°C',
-                'time': '6-48 hours',
-                'atmosphere': 'Inert or air',
-                'catalyst_loading': '5-10 mol%',
-                'additives': 'May require oxidant'
-            },
-            'Carbonylation': {
-                'temperature': '60-140°C',
-                'time': '4-24 hours',
-                'atmosphere': 'CO (1-20 atm)',
-                'catalyst_loading': '1-5 mol%',
-                'base': 'Organic base (Et₃N)'
-            }
-        }
-        
-        return conditions.get(reaction_type, {
-            'temperature': '20-100°C',
-            'time': '1-24 hours',
-            'atmosphere': 'Inert',
-            'catalyst_loading': '1-5 mol%'
-        })
+        # Plain dict copy: results are deep-copied and JSON-exported, which a mappingproxy is not
+        return dict(_typical_conditions_for(reaction_type))
     
     def _get_property_alternatives(self, reaction_type: str) -> Dict:
         """Get property-based alternative recommendations"""
-        
-        alternatives = {}
-        
         try:
-            # Get budget-friendly options
-            budget_ligands = get_reaction_specific_ligands(
-                reaction_type=reaction_type,
-                property_preferences={'price_category_max': 3}
-            )
-            if budget_ligands:
-                alternatives['budget_friendly_ligands'] = budget_ligands[:3]
-            
-            # Get low BP solvents for easy removal
-            low_bp_solvents = get_reaction_specific_solvents(
-                reaction_type=reaction_type,
-                property_preferences={'bp_max': 100}
-            )
-            if low_bp_solvents:
-                alternatives['low_boiling_solvents'] = low_bp_solvents[:3]
-            
-            # Get green/sustainable options
-            green_solvents = get_reaction_specific_solvents(
-                reaction_type=reaction_type,
-                property_preferences={'polarity_min': 3, 'bp_max': 150}
-            )
-            if green_solvents:
-                alternatives['green_solvents'] = green_solvents[:3]
-            
+            return copy.deepcopy(_property_alternatives(reaction_type))
         except Exception as e:
-            alternatives['error'] = f"Could not generate alternatives: {e}"
-        
-        return alternatives
+            return {'error': f"Could not generate alternatives: {e}"}
     
     def _get_reaction_notes(self, reaction_type: str) -> str:
         """Get reaction-specific guidance notes"""
-        
-        notes = {
-            'Cross-Coupling': """
-💡 Cross-Coupling Optimization Tips:
-• Use bulky phosphines (XPhos, SPhos) for challenging substrates
-• Polar aprotic solvents (DMF, NMP) often give best results
-• Consider base choice: K₂CO₃ for most substrates, Cs₂CO₃ for difficult cases
-• Temperature typically 80-120°C depending on substrate reactivity
-• Degassing is critical - use Schlenk techniques or glovebox
-            """,
-            'Ullmann': """
-💡 Ullmann Coupling Optimization Tips:
-• Copper sources: CuI, CuBr, Cu(OAc)₂, Cu₂O; often with simple ligands
-• Ligands: diamines (e.g., ethylenediamine), amino acids (e.g., L-proline), phenanthroline
-• Bases: K₂CO₃, Cs₂CO₃, K₃PO₄, KOtBu; water sometimes beneficial
-• Solvents: DMSO, DMF, toluene, dioxane; 80–140°C typical
-• For C–O/C–N: substrate electronics impact rates; consider stronger base for aryl chlorides
-            """,
-            'Hydrogenation': """
-💡 Hydrogenation Optimization Tips:
-• Bidentate ligands (BINAP, DuPhos) excellent for asymmetric reductions
-• Protic solvents (alcohols) often enhance reactivity
-• Start with low pressure (1-5 atm H₂) and increase if needed
-• Temperature usually mild (20-80°C) to avoid over-reduction
-• Check for catalyst poisoning from sulfur/nitrogen compounds
-            """,
-            'Metathesis': """
-💡 Metathesis Optimization Tips:
-• NHC ligands (IPr, IMes) provide high activity and stability
-• Non-coordinating solvents (DCM, toluene) are preferred
-• Strict exclusion of moisture and oxygen is essential
-• Low catalyst loadings (1-5 mol%) usually sufficient
-• Consider ring-closing vs cross-metathesis selectivity
-            """,
-            'C-H_Activation': """
-💡 C-H Activation Optimization Tips:
-• High temperatures (100-160°C) often required
-• Polar solvents (DMSO, DMF) can facilitate C-H cleavage
-• Consider directing groups for regioselectivity
-• Oxidants may be required for catalytic turnover
-• Screen different bases for optimal reactivity
-            """,
-            'Carbonylation': """
-💡 Carbonylation Optimization Tips:
-• CO pressure critical for good conversion (1-20 atm)
-• Polar solvents (DMF, NMP) enhance CO solubility
-• Phosphine ligands (PPh3, DPPF) commonly effective
-• Base helps remove HX byproducts
-• Monitor for catalyst degradation at high CO pressure
-            """
-        }
-        
-        return notes.get(reaction_type, "General organometallic reaction guidelines apply.")
+        return _REACTION_NOTES.get(reaction_type, "General organometallic reaction guidelines apply.")
     
     def get_available_recommenders(self) -> List[str]:
         """Get list of available recommendation systems"""
@@ -1507,14 +1901,22 @@ class EnhancedRecommendationEngine:
         
         return recommenders
 
-def create_recommendation_engine():
-    """Factory function to create the enhanced recommendation engine"""
+@lru_cache(maxsize=1)
+def create_recommendation_engine() -> EnhancedRecommendationEngine:
+    """Factory for the process-wide enhanced recommendation engine (built on first use)"""
     return EnhancedRecommendationEngine()
 
+
+def reset_engine() -> None:
+    """Drop the shared engine so the next create_recommendation_engine() builds a fresh one."""
+    create_recommendation_engine.cache_clear()
+
 # For backward compatibility
 RecommendationEngine = EnhancedRecommendationEngine
 
-if __name__ == "__main__":
+
+def _demo() -> None:
+    """Print recommendations for a sample Suzuki coupling (run as a script)."""
     # Test the enhanced recommendation engine
     engine = create_recommendation_engine()
     
@@ -1546,3 +1948,7 @@ if __name__ == "__main__":
             print(f"  Solvent: {best['solvent']} ({best['solvent_abbreviation']})")
             print(f"  Combined Score: {best['combined_score']}")
             print(f"  Confidence: {best['recommendation_confidence']}")
+
+
+if __name__ == "__main__":
+    _demo()
@@ -78,13 +78,15 @@ def _prune_cache(max_entries: int = 500) -> None:
     try:
         if not os.path.isdir(CACHE_DIR):
             return
-        files = [os.path.join(CACHE_DIR, fn) for fn in os.listdir(CACHE_DIR) if fn.endswith('.json')]
+        # scandir entries carry the path (and on Windows the stat) with no extra calls
+        with os.scandir(CACHE_DIR) as it:
+            files = [e for e in it if e.name.endswith('.json')]
         if len(files) <= max_entries:
             return
-        files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+        files.sort(key=lambda e: e.stat().st_mtime, reverse=True)
         for old in files[max_entries:]:
             try:
-                os.remove(old)
+                os.remove(old.path)
             except Exception:
                 continue
     except Exception:
@@ -204,11 +204,12 @@ def main() -> int:
         return 2
 
     engine = create_recommendation_engine()
-    # If engine supports options, set them via attribute to avoid breaking signature
+    # Forward QUARC flags into the engine's live options (the engine is shared, so
+    # they must land in _quarc_opts rather than in a construction-time attribute)
     try:
         quarc_opts = _extract_quarc_flags()
         if quarc_opts:
-            setattr(engine, '_cli_quarc_options', quarc_opts)
+            engine._quarc_opts.update({k: v for k, v in quarc_opts.items() if v is not None})
     except Exception:
         pass
     recs = engine.get_recommendations(reaction_smiles, selected_type)
@@ -1,5 +1,6 @@
 import os
 import json
+import sys
 import numpy as np
 import pandas as pd
 from typing import Dict, Optional
@@ -74,6 +75,9 @@ def create_ligand_dataframe(json_path: str | None = None, json_dir: str | None =
 
     def _normalize_entry(entry: dict) -> dict:
         name = entry.get('ligand') or entry.get('name') or entry.get('Ligand')
+        if isinstance(name, str):
+            # Interned: names are reused as lookup keys (e.g. synergy pairs) downstream
+            name = sys.intern(name)
         rc = entry.get('reaction_compatibility') or entry.get('Reaction_Compatibility')
         if isinstance(rc, dict):
             order = ["Cross-Coupling", "Hydrogenation", "Metathesis", "C-H_Activation", "Carbonylation"]
@@ -1,5 +1,6 @@
 import os
 import json
+import sys
 import numpy as np
 import pandas as pd
 
@@ -75,6 +76,11 @@ def create_solvent_dataframe(json_path: str | None = None, json_dir: str | None
     def _normalize_entry(entry: dict) -> dict:
         name = entry.get('solvent') or entry.get('name') or entry.get('Solvent')
         abbr = entry.get('abbreviation') or entry.get('Abbreviation')
+        # Interned: names are reused as lookup keys (e.g. synergy pairs) downstream
+        if isinstance(name, str):
+            name = sys.intern(name)
+        if isinstance(abbr, str):
+            abbr = sys.intern(abbr)
         cas = entry.get('cas') or entry.get('CAS Number')
         rc = entry.get('reaction_compatibility') or entry.get('Reaction_Compatibility')
         if isinstance(rc, dict):
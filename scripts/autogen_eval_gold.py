@@ -53,10 +53,10 @@ def _derive_base(row: Dict) -> str:
 
 def _scan_dataset(data_dir: str) -> List[Dict]:
     pool: List[Dict] = []
-    for fname in os.listdir(data_dir):
-        if not fname.lower().endswith(('.csv', '.tsv')):
-            continue
-        path = os.path.join(data_dir, fname)
+    with os.scandir(data_dir) as it:
+        entries = [e for e in it if e.name.lower().endswith(('.csv', '.tsv')) and e.is_file()]
+    for entry in entries:
+        fname, path = entry.name, entry.path
         delim = '\t' if fname.lower().endswith('.tsv') else ','
         try:
             with open(path, 'r', encoding='utf-8') as f:
@@ -30,10 +30,10 @@ def _ensure_dir(p: str):
 
 def _load_pool(data_dir: str) -> List[Dict]:
     pool: List[Dict] = []
-    for fname in os.listdir(data_dir):
-        if not fname.lower().endswith(('.csv', '.tsv')):
-            continue
-        path = os.path.join(data_dir, fname)
+    with os.scandir(data_dir) as it:
+        entries = [e for e in it if e.name.lower().endswith(('.csv', '.tsv')) and e.is_file()]
+    for entry in entries:
+        fname, path = entry.name, entry.path
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f, delimiter='\t') if fname.lower().endswith('.tsv') else csv.DictReader(f)
@@ -321,8 +321,9 @@ class SimplePredictionWorker(QThread):
             
             # Try to use enhanced recommendation engine first
             try:
-                from enhanced_recommendation_engine import EnhancedRecommendationEngine
-                engine = EnhancedRecommendationEngine()
+                # Shared engine: keeps its loaded tables and result memo across predictions
+                from enhanced_recommendation_engine import create_recommendation_engine
+                engine = create_recommendation_engine()
                 self.progress.emit(60)
                 
                 # Get enhanced recommendations
@@ -1,4 +1,7 @@
 import os
+
+import pytest
+
 from analytics.adapters import adapt_dataset_for_type
 
 
@@ -12,3 +15,28 @@ def test_adapt_ullmann_loads(tmp_path):
     )
     rows = adapt_dataset_for_type("Ullmann", str(p))
     assert rows and rows[0].reaction_type
+
+
+def test_adapt_cache_invalidates_on_change(tmp_path):
+    p = tmp_path / "mini_ullmann.csv"
+    header = "ReactionType,Solvent\n"
+    p.write_text(header + "Ullmann,DMSO\n", encoding="utf-8")
+    first = adapt_dataset_for_type("Ullmann", str(p))
+    assert adapt_dataset_for_type("Ullmann", str(p)) == first
+    p.write_text(header + "Ullmann,DMSO\nUllmann,DMF\n", encoding="utf-8")
+    assert len(adapt_dataset_for_type("Ullmann", str(p))) == 2
+
+
+@pytest.mark.parametrize("backend", ["pyarrow", "stdlib"])
+def test_read_csv_columns_keeps_literal_na(tmp_path, monkeypatch, backend):
+    import analytics.adapters as ad
+
+    if backend == "pyarrow":
+        pytest.importorskip("pyarrow.csv")
+    else:
+        monkeypatch.setattr(ad, "pacsv", None)
+    p = tmp_path / "mini.csv"
+    p.write_text("Ligand,Solvent\nNA,\n", encoding="utf-8")
+    cols = ad._read_csv_columns(str(p), ["Ligand", "Solvent"])
+    assert cols["Ligand"] == ["NA"]
+    assert cols["Solvent"][0] in (None, "")
@@ -0,0 +1,20 @@
+from analytics.aggregate import _largest, _stats
+
+
+def test_stats_winsorized_percentiles():
+    vals = [float(v) for v in range(1, 101)] + [10000.0]
+    st = _stats(vals)
+    assert st["n"] == 101
+    assert st["median"] == 51.0
+    assert st["p25"] == 26.0
+    assert st["p75"] == 76.0
+
+
+def test_stats_empty():
+    assert _stats([]) == {"median": None, "p25": None, "p75": None, "n": 0}
+
+
+def test_largest_keeps_top_k_in_count_order():
+    counts = {"a": 1, "b": 3, "c": 3, "d": 2}
+    assert _largest(counts, 2) == [("b", 3), ("c", 3)]
+    assert [k for k, _ in _largest(counts)] == ["b", "c", "d", "a"]
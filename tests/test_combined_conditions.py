@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from enhanced_recommendation_engine import (
+    _SYNERGIES,
+    _TYPICAL_CONDITIONS,
+    EnhancedRecommendationEngine,
+    _property_alternatives,
+)
+
+
+def test_static_tables_are_read_only_and_callers_get_copies():
+    eng = EnhancedRecommendationEngine()
+    with pytest.raises(TypeError):
+        _SYNERGIES["Ullmann"][("L-Proline", "DMSO")] = 1.0
+    cond = eng._get_typical_conditions("L-Proline", "DMSO", "Ullmann")
+    cond["temperature"] = "n/a"
+    assert _TYPICAL_CONDITIONS["Ullmann"]["temperature"] == "80-140°C"
+    assert eng._calculate_synergy_bonus("L-Proline", "DMSO", "Ullmann") == 0.08
+    assert eng._calculate_synergy_bonus("L-Proline", "DMSO", "Unknown") == 0.0
+
+
+def test_property_alternatives_are_memoized_per_reaction_type():
+    eng = EnhancedRecommendationEngine()
+    first = eng._get_property_alternatives("Cross-Coupling")
+    hits = _property_alternatives.cache_info().hits
+    first.clear()
+    again = eng._get_property_alternatives("Cross-Coupling")
+    assert _property_alternatives.cache_info().hits == hits + 1
+    assert again and "error" not in again
+
+
+def test_solvent_abbreviations_come_from_the_solvent_database():
+    from enhanced_recommendation_engine import _solvent_abbreviations
+
+    abbrev = _solvent_abbreviations()
+    assert abbrev["Tetrahydrofuran"] == "THF"
+    assert abbrev["THF"] == "THF"
+    with pytest.raises(TypeError):
+        abbrev["Water"] = "aq"
@@ -0,0 +1,13 @@
+from dataset_registry import DATASET_MAP, clear_cache, resolve_dataset_path
+
+
+def test_ullmann_labels_resolve_to_one_dataset(tmp_path):
+    ds = tmp_path / "data" / "reaction_dataset"
+    ds.mkdir(parents=True)
+    clear_cache()
+    assert resolve_dataset_path("Ullmann", str(tmp_path)) is None
+    (ds / "Ullman-2020-2024.tsv").write_text("ReactionType\nUllmann\n", encoding="utf-8")
+    labels = [k for k in DATASET_MAP if "Ullmann" in k] + ["C-N Coupling - Ullmann (Cu)", "ullmann"]
+    paths = {resolve_dataset_path(lbl, str(tmp_path)) for lbl in labels}
+    assert paths == {str(ds / "Ullman-2020-2024.tsv")}
+    clear_cache()
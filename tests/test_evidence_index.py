@@ -0,0 +1,87 @@
+import os
+
+from enhanced_recommendation_engine import (
+    _build_evidence_index,
+    _dataset_signature,
+    _scan_evidence_file,
+    _split_listlike,
+    _top_evidence,
+)
+
+
+def test_evidence_index_rescans_only_changed_files(tmp_path):
+    header = "ReactionType,Ligand,Solvent,ReagentRaw\n"
+    (tmp_path / "a.csv").write_text(header + 'Ullmann,L-Proline,DMSO,"[""K2CO3|584-08-7""]"\n', encoding="utf-8")
+    b = tmp_path / "b.csv"
+    b.write_text(header + "Ullmann,L-Proline,DMF,\n", encoding="utf-8")
+    index = _build_evidence_index(str(tmp_path), _dataset_signature(str(tmp_path)))
+    assert index["Ullmann"]["ligand"][0] == {"L-Proline": 2}
+    assert index["Ullmann"]["base"][0] == {"K2CO3": 1}
+
+    b.write_text(header + "Ullmann,DMEDA,DMF,\n", encoding="utf-8")
+    os.utime(b, ns=(0, 10**9))
+    misses = _scan_evidence_file.cache_info().misses
+    index = _build_evidence_index(str(tmp_path), _dataset_signature(str(tmp_path)))
+    assert _scan_evidence_file.cache_info().misses == misses + 1
+    assert index["Ullmann"]["ligand"][0] == {"L-Proline": 1, "DMEDA": 1}
+
+
+def test_top_evidence_keeps_ten_by_count_then_first_seen(tmp_path):
+    rows = [f"Ullmann,L{i}\n" for i in range(12)] + ["Ullmann,L11\n", "Ullmann,L5\n"]
+    (tmp_path / "a.csv").write_text("ReactionType,Ligand\n" + "".join(rows), encoding="utf-8")
+    top = _top_evidence(str(tmp_path), _dataset_signature(str(tmp_path)), "Ullmann", "ligand")
+    assert [name for name, _ in top] == ["L5", "L11", "L0", "L1", "L2", "L3", "L4", "L6", "L7", "L8"]
+    assert top[0] == ("L5", 2.0)
+
+
+def test_split_listlike_only_strips_outer_brackets():
+    assert _split_listlike('["[Pd(allyl)Cl]2|12012-95-2", " DMF "]') == ["[Pd(allyl)Cl]2|12012-95-2", "DMF"]
+    assert _split_listlike("K2CO3") == ["K2CO3"]
+    assert _split_listlike("[]") == []
+
+
+def test_iter_dataset_rows_handles_missing_columns_and_short_rows(tmp_path, monkeypatch):
+    import enhanced_recommendation_engine as ere
+
+    monkeypatch.setattr(ere, "pacsv", None)
+    p = tmp_path / "mini.tsv"
+    p.write_text("Ligand\tReactionType\nDMEDA\tUllmann\n\nBINAP\n", encoding="utf-8")
+    rows = list(ere._iter_dataset_rows(str(p), ("ReactionType", "Ligand", "Base")))
+    assert rows == [("Ullmann", "DMEDA", None), (None, "BINAP", None)]
+
+
+def test_base_token_regex_fallback(monkeypatch):
+    import enhanced_recommendation_engine as ere
+
+    monkeypatch.setattr(ere, "_BASE_TOKEN_AUTOMATON", None)
+    assert ere._has_base_token("cesium carbonate (cs2co3)")
+    assert ere._has_base_token("ko-tbu")
+    assert not ere._has_base_token("dimethyl sulfoxide")
+
+
+def test_similarity_fingerprints_reload_from_disk(tmp_path, monkeypatch):
+    import enhanced_recommendation_engine as ere
+
+    monkeypatch.setattr(ere, "_FP_CACHE_DIR", str(tmp_path / "fp"))
+    p = tmp_path / "mini.tsv"
+    p.write_text("ReactantSMILES\tProductSMILES\nBrc1ccccc1.NCC\tc1ccccc1NCC\nnot-a-smiles\t\n", encoding="utf-8")
+    st = p.stat()
+    fps = ere._similarity_fingerprints(str(p), st.st_mtime_ns, st.st_size)
+    assert fps[0][0] is not None and fps[1] == (None, None)
+
+    ere._similarity_fingerprints.cache_clear()
+
+    def _boom(smiles):
+        raise AssertionError("fingerprints should come from the disk cache")
+
+    monkeypatch.setattr(ere, "_mixture_fingerprint", _boom)
+    again = ere._similarity_fingerprints(str(p), st.st_mtime_ns, st.st_size)
+    assert again[0][0] == fps[0][0]
+
+
+def test_hit_cell_names_parse_json_and_crude_lists():
+    from enhanced_recommendation_engine import _hit_cell_names
+
+    assert _hit_cell_names('["XPhos|564483-18-7", " |584-08-7"]') == ("XPhos", "584-08-7")
+    assert _hit_cell_names("[DMF, 'THF']") == ("DMF", "THF")
+    assert _hit_cell_names("") == ()
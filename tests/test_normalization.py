@@ -1,4 +1,4 @@
-from analytics.normalization import canonicalize, parse_numeric, map_solvent, map_base
+from analytics.normalization import canonicalize, parse_numeric, map_solvent, map_base, build_synonym_index, synonym_lookup
 
 
 def test_canonicalize_basic():
@@ -20,3 +20,10 @@ def test_solvent_mapping_dmso():
 def test_base_mapping_aliases():
     assert map_base("potassium carbonate") == "k2co3"
     assert map_base("K3PO4") == "k3po4"
+
+
+def test_synonym_index_first_entry_wins():
+    index = build_synonym_index({"a": ["x"], "b": ["x", "y"]})
+    assert synonym_lookup("X", index) == "a"
+    assert synonym_lookup("y", index) == "b"
+    assert synonym_lookup("unknown tok", index) == "unknowntok"
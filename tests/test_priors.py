@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from enhanced_recommendation_engine import AnalyticsCfg, EnhancedRecommendationEngine
+
+
+def test_freq_priors_boost_penalize_and_resort():
+    eng = EnhancedRecommendationEngine()
+    items = [
+        {"solvent": "Toluene", "compatibility_score": 0.9},
+        {"solvent": "DMF", "compatibility_score": 0.8},
+        {"solvent": "Water", "compatibility_score": 0.0},
+    ]
+    pri_map = eng._canon_prior_map({"DMF": 0.25, "Toluene": 0.001}, "solvents")
+    out = eng._apply_freq_priors(items, pri_map, "solvents")
+    # DMF: 0.8 * (1 + 0.45 * sqrt(0.25)) = 0.98; Toluene below min support: 0.9 * 0.85
+    assert [(x["solvent"], x["compatibility_score"]) for x in out] == [
+        ("DMF", 0.98),
+        ("Toluene", 0.765),
+        ("Water", 0.0),
+    ]
+
+
+def test_freq_priors_cap_at_one():
+    eng = EnhancedRecommendationEngine()
+    out = eng._apply_freq_priors([{"ligand": "L-Proline", "compatibility_score": 0.95}], {"l-proline": 0.5}, "ligands")
+    assert out[0]["compatibility_score"] == 1.0
+
+
+def test_freq_priors_top_n_matches_full_sort_prefix():
+    eng = EnhancedRecommendationEngine()
+    make = lambda: [{"base": n, "compatibility_score": s} for n, s in (("A", 0.5), ("B", 0.7), ("C", 0.5), ("D", 0.9))]
+    full = eng._apply_freq_priors(make(), {"d": 0.5}, "bases")
+    top = eng._apply_freq_priors(make(), {"d": 0.5}, "bases", top_n=3)
+    assert [x["base"] for x in top] == [x["base"] for x in full][:3] == ["D", "B", "A"]
+
+
+def test_analytics_cfg_resolves_fallbacks():
+    cfg = AnalyticsCfg.from_dict({"w_freq": 0.2, "w_freq_bases": 0.4, "penalty_factor": 0.9,
+                                  "apply_to": {"bases": True}})
+    assert (cfg.weight("bases"), cfg.weight("ligands")) == (0.4, 0.2)
+    assert cfg.penalty("solvents") == 0.9
+    assert cfg.applies("bases") and not cfg.applies("ligands")
+    assert AnalyticsCfg.from_dict({"soft_penalty": False}).penalty("bases") is None
+
+
+def test_analytics_priors_cached_per_summary_and_copied(tmp_path, monkeypatch):
+    import enhanced_recommendation_engine as ere
+
+    summary = tmp_path / "latest.json"
+    summary.write_text('{"top": {"bases": [{"name": "K2CO3", "pct": 0.4}, {"name": "", "pct": 0.1}]}}', encoding="utf-8")
+    eng = EnhancedRecommendationEngine()
+    monkeypatch.setattr(eng, "_analytics_summary_path", lambda rt: str(summary))
+    pri, canon = eng._analytics_priors("Ullmann", "bases")
+    assert pri == {"K2CO3": 0.4} and canon == {"k2co3": 0.4}
+    canon.clear()
+    misses = ere._summary_priors.cache_info().misses
+    assert eng._analytics_priors("Ullmann", "bases")[1] == {"k2co3": 0.4}
+    assert ere._summary_priors.cache_info().misses == misses
+    assert eng._analytics_priors("Ullmann", "ligands") == (None, {})
+
+
+def test_enhanced_recommendations_refresh_when_dataset_changes(tmp_path, monkeypatch):
+    import os
+
+    import enhanced_recommendation_engine as ere
+
+    data = tmp_path / "mini.csv"
+    data.write_text("ReactionType,Ligand\nUllmann,DMEDA\n", encoding="utf-8")
+    monkeypatch.setattr(ere, "_DATASET_DIR", str(tmp_path))
+    eng = EnhancedRecommendationEngine()
+    builds = []
+    monkeypatch.setattr(eng, "_build_enhanced_recommendations",
+                        lambda smi, rt: builds.append(smi) or {"builds": len(builds)})
+    assert eng._get_enhanced_recommendations("CCBr.N>>CCN", "Ullmann") == {"builds": 1}
+    assert eng._get_enhanced_recommendations("CCBr.N>>CCN", "Ullmann") == {"builds": 1}
+    os.utime(data, ns=(0, 10**9))
+    assert eng._get_enhanced_recommendations("CCBr.N>>CCN", "Ullmann") == {"builds": 2}
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+
+from enhanced_recommendation_engine import EnhancedRecommendationEngine
+
+
+def test_cross_coupling_needs_real_halogen():
+    eng = EnhancedRecommendationEngine()
+    # Carbon alone must not count as a halogen (old pattern matched 'C'/'l'/'r')
+    assert not eng._is_cross_coupling_pattern("CCO.NCC", "CCNCC")
+    assert eng._is_cross_coupling_pattern("c1ccc(Br)cc1.c1ccc(B(O)O)cc1", "")
+    assert eng._is_cross_coupling_pattern("Clc1ccncc1.NCC", "")
+
+
+def test_map_reaction_type_strips_metal_suffix():
+    eng = EnhancedRecommendationEngine()
+    assert eng._map_reaction_type("C-N Coupling - Ullmann (Cu)") == "Ullmann"
+    assert eng._map_reaction_type("Heck Coupling") == "Cross-Coupling"
+    assert eng._map_reaction_type("Unknown (Pd)") is None
+
+
+def test_map_reaction_type_rules_cover_label_families():
+    eng = EnhancedRecommendationEngine()
+    assert eng._map_reaction_type("C-C Coupling - Kumada (Ni)") == "Cross-Coupling"
+    assert eng._map_reaction_type("Buchwald-Hartwig Amination") == "Cross-Coupling"
+    assert eng._map_reaction_type("C-N Oxidative Coupling - Chan-Lam") == "Cross-Coupling"
+    assert eng._map_reaction_type("Transfer Hydrogenation") == "Hydrogenation"
+    assert eng._map_reaction_type("Oxidation") == "C-H_Activation"
+    assert eng._map_reaction_type("Swern Oxidation") is None
+
+
+def test_hydrogenation_detects_unsaturation_drop():
+    eng = EnhancedRecommendationEngine()
+    assert eng._is_hydrogenation_pattern("C=CC(=O)O", "CCC(=O)O")
+    assert eng._is_hydrogenation_pattern("CC#N", "CC=N")
+    assert not eng._is_hydrogenation_pattern("CCO", "CCO")
+
+
+def test_analyze_reaction_type_without_arrow():
+    eng = EnhancedRecommendationEngine()
+    assert eng.analyze_reaction_type("CCO", "Auto-detect") == "General Organic Reaction"
+    assert eng.analyze_reaction_type("C=CC(=O)O>>CCC(=O)O", "Auto-detect") == "Hydrogenation"
+
+
+def test_missing_base_recommender_yields_no_bases(monkeypatch):
+    import enhanced_recommendation_engine as ere
+
+    if not ere.ENHANCED_REAGENTS_AVAILABLE:
+        pytest.skip("reagent recommenders not importable")
+    monkeypatch.setattr(ere, "recommend_bases_for_reaction", None)
+    recs = ere.EnhancedRecommendationEngine()._build_enhanced_recommendations("Clc1ccncc1.NCC>>CCNc1ccncc1", "Ullmann")
+    assert recs["base_recommendations"] == []
+    assert "error" not in recs
+
+
+def test_carbonylation_counts_both_carbonyl_spellings():
+    eng = EnhancedRecommendationEngine()
+    assert eng._is_carbonylation_pattern("c1ccccc1Br", "c1ccccc1C(=O)O")
+    assert eng._is_carbonylation_pattern("CC(=O)O", "O=CC(=O)O") is False
+    assert eng._is_carbonylation_pattern("CC(=O)O", "CC=O.CC(=O)O")
+
+
+def test_token_counts_count_each_token_independently():
+    from enhanced_recommendation_engine import _token_counts
+
+    c = _token_counts("CC(=O)Br")
+    # Overlapping tokens are all counted, as str.count would
+    assert (c["C"], c["C(=O)"], c["="], c["Br"], c["B(O)"]) == (2, 1, 1, 1, 0)
+
+
+def test_pattern_predicates_share_one_scan_per_side():
+    from enhanced_recommendation_engine import _token_counts
+
+    eng = EnhancedRecommendationEngine()
+    reactants, products = "c1ccccc1I.CC(C)O", "c1ccccc1C(=O)OC(C)C"
+    eng._is_carbonylation_pattern(reactants, products)
+    misses = _token_counts.cache_info().misses
+    eng._is_ch_activation_pattern(reactants, products)
+    eng._is_hydrogenation_pattern(reactants, products)
+    assert _token_counts.cache_info().misses == misses
+
+
+def test_mapped_gui_type_skips_pattern_scan():
+    from enhanced_recommendation_engine import _token_counts
+
+    eng = EnhancedRecommendationEngine()
+    before = _token_counts.cache_info()
+    assert eng.analyze_reaction_type("Brc1ccccc1.NCC>>c1ccccc1NCC", "Hydrogenation (Pd)") == "Hydrogenation"
+    after = _token_counts.cache_info()
+    assert (after.hits, after.misses) == (before.hits, before.misses)
+
+
+def test_could_be_buchwald_precheck():
+    from enhanced_recommendation_engine import _could_be_buchwald
+
+    assert _could_be_buchwald("Brc1ccccc1.NCC>>c1ccccc1NCC", "auto-detect")
+    assert _could_be_buchwald("CCO>>CC=O", "c-n coupling - buchwald-hartwig (pd)")
+    # Nitrogen only in the product cannot satisfy the base recommender's pattern
+    assert not _could_be_buchwald("Brc1ccccc1.OB(O)c1ccccc1>>c1ccccc1-c1ccccc1N", "")
+
+
+def test_create_recommendation_engine_is_shared_until_reset():
+    from enhanced_recommendation_engine import create_recommendation_engine, reset_engine
+
+    eng = create_recommendation_engine()
+    assert create_recommendation_engine() is eng
+    reset_engine()
+    assert create_recommendation_engine() is not eng